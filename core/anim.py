@@ -1,6 +1,103 @@
-import os, glob
+import re
+import json
+import fnmatch
+import weakref
 import pygame as pg
-from core.resources import img
+from core.resources import img, asset_index
+
+# атлас кадров (tools/pack_atlas.py); папки, которых в нём нет, грузятся по файлам
+ATLAS = "atlas/sprites.json"
+
+
+class FrameSet:
+    """
+    Загруженные (и отмасштабированные) кадры одной папки, общие для всех спрайтов.
+    Только для чтения: списки кадров — кортежи, поверхности не меняем.
+    """
+
+    def __init__(self, frames: dict[str, tuple[pg.Surface, ...]]):
+        self.frames = frames
+        self.refs = 0
+
+
+# (base_dir, scale) -> FrameSet; живёт, пока на него ссылается хоть один спрайт
+_FRAME_SETS: dict[tuple[str, float], FrameSet] = {}
+
+
+def _acquire_frames(base_dir: str, scale: float) -> FrameSet:
+    key = (base_dir, float(scale))
+    fs = _FRAME_SETS.get(key)
+    if fs is None:
+        fs = _FRAME_SETS[key] = FrameSet(_load_frames(base_dir, scale))
+    fs.refs += 1
+    return fs
+
+
+def _release_frames(key: tuple[str, float]):
+    fs = _FRAME_SETS.get(key)
+    if fs is None:
+        return
+    fs.refs -= 1
+    if fs.refs <= 0:
+        del _FRAME_SETS[key]
+
+
+_ATLAS_MAP = None
+
+
+def atlas_map() -> dict:
+    """Карта кадров атласа (читается один раз); {} если атласа нет."""
+    global _ATLAS_MAP
+    if _ATLAS_MAP is None:
+        path = asset_index("img").find(ATLAS)
+        _ATLAS_MAP = {}
+        if path is not None:
+            with open(path, "r", encoding="utf-8") as f:
+                _ATLAS_MAP = json.load(f)
+    return _ATLAS_MAP
+
+
+def _load_frames(base_dir: str, scale: float) -> dict[str, tuple[pg.Surface, ...]]:
+    atlas = atlas_map()
+    actor = atlas.get("actors", {}).get(base_dir)
+    if actor is not None:
+        # кадры — окна в общем листе, без копий пикселей
+        sheet = img(atlas["image"])
+        raw = {d: [sheet.subsurface(r) for r in actor.get(d, [])] for d in AnimatedSprite.DIRECTIONS}
+    else:
+        raw = {d: [img(f) for f in files] for d, files in AnimatedSprite.frame_names(base_dir).items()}
+
+    frames = {}
+    for d, surfs in raw.items():
+        if scale != 1.0:
+            surfs = [pg.transform.smoothscale(s, (int(s.get_width()*scale), int(s.get_height()*scale)))
+                     for s in surfs]
+        frames[d] = tuple(surfs)
+
+    # если какие-то наборы пустые — подменим ближайшими
+    def fallback(dst, src):
+        if not frames[dst] and frames[src]:
+            frames[dst] = frames[src]
+    fallback("left", "right"); fallback("right", "left")
+    fallback("forward", "back");    fallback("back", "forward")
+    return frames
+
+
+_FRAME_NO = re.compile(r"_(\d+)\.png$")
+
+
+def frame_sort_key(name: str):
+    """
+    Порядок кадров: по номеру в конце имени (walk_2 < walk_10), затем по имени.
+    Общий для AnimatedSprite и tools/pack_atlas.py — иначе атлас и отдельные файлы разойдутся.
+    """
+    m = _FRAME_NO.search(name)
+    return (int(m.group(1)) if m else 0, name)
+
+
+def frame_cache_stats() -> dict:
+    return {f"{d}@{sc}": fs.refs for (d, sc), fs in _FRAME_SETS.items()}
+
 
 class AnimatedSprite:
     """
@@ -11,29 +108,38 @@ class AnimatedSprite:
       up_0.png .. up_3.png
       down_0.png .. down_3.png
     Кол-во кадров может отличаться — берём все кадры по маске.
+    Если папка упакована в атлас (tools/pack_atlas.py) — кадры берутся оттуда.
+    Кадры грузятся один раз на (папка, масштаб) и делятся между экземплярами.
     """
-    def __init__(self, base_dir="character", fps=10, scale=1.0):
-        self.frames = {d: [] for d in ("left","right","forward","back")}
-        root = os.path.join("assets", "img", base_dir)
-        for d in self.frames:
+    DIRECTIONS = ("left", "right", "forward", "back")
+
+    @classmethod
+    def frame_names(cls, base_dir="character") -> dict[str, list[str]]:
+        """Имена картинок кадров по направлениям (для img() и предзагрузки)."""
+        names = asset_index("img").listdir(base_dir)
+        out = {}
+        for d in cls.DIRECTIONS:
             # собираем все кадры по направлению, сортируем по номеру
-            files = sorted(glob.glob(os.path.join(root, f"{d}_*.png")))
+            files = sorted(fnmatch.filter(names, f"{d}_*.png"), key=frame_sort_key)
             if not files:
                 # запасной вариант: vl_{d}_*.png
-                files = sorted(glob.glob(os.path.join(root, f"vl_{d}_*.png")))
-            for f in files:
-                surf = img(os.path.join(base_dir, os.path.basename(f)))
-                if scale != 1.0:
-                    w, h = surf.get_width(), surf.get_height()
-                    surf = pg.transform.smoothscale(surf, (int(w*scale), int(h*scale)))
-                self.frames[d].append(surf)
-
-        # если какие-то наборы пустые — подменим ближайшими
-        def fallback(dst, src):
-            if not self.frames[dst] and self.frames[src]:
-                self.frames[dst] = self.frames[src]
-        fallback("left", "right"); fallback("right", "left")
-        fallback("forward", "back");    fallback("back", "forward")
+                files = sorted(fnmatch.filter(names, f"vl_{d}_*.png"), key=frame_sort_key)
+            out[d] = [f"{base_dir}/{f}" for f in files]
+        return out
+
+    @classmethod
+    def asset_names(cls, base_dir="character") -> list[str]:
+        """Что грузить для папки: лист атласа или отдельные кадры (для предзагрузки)."""
+        atlas = atlas_map()
+        if base_dir in atlas.get("actors", {}):
+            return [atlas["image"]]
+        return [f for files in cls.frame_names(base_dir).values() for f in files]
+
+    def __init__(self, base_dir="character", fps=10, scale=1.0):
+        # кадры общие на процесс: второй спрайт той же папки ничего не грузит
+        self._frameset = _acquire_frames(base_dir, scale)
+        self.frames = self._frameset.frames
+        weakref.finalize(self, _release_frames, (base_dir, float(scale)))
 
         self.fps = fps
         self.timer = 0.0
@@ -60,9 +166,10 @@ class AnimatedSprite:
             self.index = 0
             self.timer = 0.0
 
-    def draw(self, surface: pg.Surface):
+    def draw(self, surface: pg.Surface, camera=(0, 0)):
+        """camera — левый верхний угол видимой области мира (для сцен с прокруткой)."""
         frame = self.frames[self.direction][self.index]
-        draw_pos = (int(self.pos.x - self.offset.x), int(self.pos.y - self.offset.y))
+        draw_pos = (int(self.pos.x - self.offset.x - camera[0]), int(self.pos.y - self.offset.y - camera[1]))
         surface.blit(frame, draw_pos)
 
     def get_rect(self) -> pg.Rect:
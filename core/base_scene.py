@@ -1,8 +1,39 @@
 class BaseScene:
+    """
+    Сцена может дополнительно определить reset(): тогда при повторном входе
+    с теми же аргументами (ретрай) SceneManager вызовет его вместо
+    создания новой сцены и повторной загрузки ресурсов.
+    """
+
+    @classmethod
+    def preload_assets(cls, screen_size, **kwargs):
+        """Картинки, которые можно загрузить до входа: имена или (имя, size, smooth)."""
+        return []
+
     def __init__(self, manager):
         self.mgr = manager
         self.screen = manager.screen
+        # True — в следующем draw() нужно перерисовать экран целиком
+        self.full_redraw = True
+        # доля шага симуляции (0..1) между прошлым и текущим update — для интерполяции
+        self.interp = 1.0
+
+    def next_targets(self):
+        """
+        Сцены, куда отсюда можно вернуться или перейти: список (класс, kwargs).
+        SceneManager держит в пуле только их (например, игру за ретрай-кат-сценой).
+        """
+        return []
 
     def handle_event(self, event): pass
     def update(self, dt): pass
-    def draw(self): pass
+
+    def draw(self):
+        """
+        Рисует сцену. Может вернуть список изменившихся pg.Rect
+        (пустой — ничего не менялось); None — изменился весь экран.
+        """
+        pass
+
+    def invalidate(self):
+        self.full_redraw = True
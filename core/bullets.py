@@ -0,0 +1,103 @@
+from itertools import islice
+import pygame as pg
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy режим «bullet hell» просто недоступен
+    np = None
+
+AVAILABLE = np is not None
+
+
+def bullet_sprite(size, color, radius=2) -> pg.Surface:
+    """Одна пуля, отрисованная заранее: в кадре её только блитят."""
+    surf = pg.Surface(size, pg.SRCALPHA)
+    pg.draw.rect(surf, color, surf.get_rect(), border_radius=radius)
+    return surf.convert_alpha() if pg.display.get_surface() else surf
+
+
+class BulletField:
+    """
+    Пачка одинаковых пуль в массивах NumPy: позиции (левый верхний угол)
+    и скорости, по строке на пулю. Движение, отсев вылетевших за экран
+    и проверка пересечения с прямоугольником — векторно, без цикла по пулям.
+    Живые пули всегда лежат в первых n строках; удаление — сжатие по маске.
+    """
+
+    def __init__(self, size, capacity=1024):
+        self.w, self.h = size
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.n = 0
+        # для draw(): целые координаты и готовые пары (спрайт, строка ipos) —
+        # строки это представления ipos, так что в кадре ничего не аллоцируется
+        self._ipos = np.zeros((capacity, 2), np.int32)
+        self._jobs = []
+        self._jobs_sprite = None
+
+    def __len__(self):
+        return self.n
+
+    def _reserve(self, extra):
+        need = self.n + extra
+        cap = len(self.pos)
+        if need <= cap:
+            return
+        while cap < need:
+            cap *= 2
+        for name in ("pos", "vel"):
+            old = getattr(self, name)
+            new = np.zeros((cap, 2), np.float32)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+        self._ipos = np.zeros((cap, 2), np.int32)
+        self._jobs = []
+
+    def spawn(self, x, y, vx, vy):
+        """Добавить пули; x, y, vx, vy — числа или массивы одной длины."""
+        x, y, vx, vy = np.broadcast_arrays(x, y, vx, vy)
+        k = x.size
+        if not k:
+            return
+        self._reserve(k)
+        a, b = self.n, self.n + k
+        self.pos[a:b, 0] = x.ravel()
+        self.pos[a:b, 1] = y.ravel()
+        self.vel[a:b, 0] = vx.ravel()
+        self.vel[a:b, 1] = vy.ravel()
+        self.n = b
+
+    def step(self, dt):
+        self.pos[:self.n] += self.vel[:self.n] * dt
+
+    def overlaps(self, rect):
+        """Маска пуль (длины n), пересекающих rect."""
+        p = self.pos[:self.n]
+        return ((p[:, 0] < rect.right) & (p[:, 0] + self.w > rect.left) &
+                (p[:, 1] < rect.bottom) & (p[:, 1] + self.h > rect.top))
+
+    def keep(self, mask):
+        """Оставить только пули, отмеченные mask (длины n)."""
+        k = int(np.count_nonzero(mask))
+        if k == self.n:
+            return
+        self.pos[:k] = self.pos[:self.n][mask]
+        self.vel[:k] = self.vel[:self.n][mask]
+        self.n = k
+
+    def cull(self, rect):
+        """Выбросить пули, целиком ушедшие за rect (обычно — экран)."""
+        self.keep(self.overlaps(rect))
+
+    def clear(self):
+        self.n = 0
+
+    def draw(self, surface: pg.Surface, sprite: pg.Surface):
+        """Все пули одним вызовом blits по заранее собранной последовательности."""
+        if not self.n:
+            return
+        np.copyto(self._ipos[:self.n], self.pos[:self.n], casting="unsafe")
+        if self._jobs_sprite is not sprite or len(self._jobs) != len(self._ipos):
+            self._jobs = [(sprite, row) for row in self._ipos]
+            self._jobs_sprite = sprite
+        surface.blits(islice(self._jobs, self.n), doreturn=False)
@@ -0,0 +1,223 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy толпа считается циклом — годится для десятков агентов
+    np = None
+
+
+class UniformGrid:
+    """
+    Равномерная сетка для запросов «кто в радиусе r от точки».
+    С NumPy точки сортируются по номеру клетки (argsort), и клетки одного ряда
+    сетки — это один непрерывный отрезок, который находится двумя searchsorted.
+    Без NumPy — обычный словарь клетка -> индексы.
+    """
+
+    def __init__(self, cell: float):
+        self.cell = float(cell)
+        self.xs = self.ys = ()
+        self.n = 0
+
+    def build(self, xs, ys):
+        """Разложить точки по клеткам; xs, ys — массивы/списки одной длины."""
+        self.xs, self.ys = xs, ys
+        self.n = len(xs)
+        if np is not None:
+            cx = np.maximum(np.asarray(xs) // self.cell, 0).astype(np.int64)
+            cy = np.maximum(np.asarray(ys) // self.cell, 0).astype(np.int64)
+            self.gw = int(cx.max()) + 1 if self.n else 1
+            key = cy * self.gw + cx
+            self.order = np.argsort(key, kind="stable")
+            self.keys = key[self.order]
+        else:
+            self.cells = {}
+            for i, (x, y) in enumerate(zip(xs, ys)):
+                k = (max(0, int(x // self.cell)), max(0, int(y // self.cell)))
+                self.cells.setdefault(k, []).append(i)
+        return self
+
+    def query(self, x, y, r) -> list[int]:
+        """Индексы точек не дальше r от (x, y)."""
+        if not self.n:
+            return []
+        c = self.cell
+        cx0, cx1 = max(0, int((x - r) // c)), int((x + r) // c)
+        cy0, cy1 = max(0, int((y - r) // c)), int((y + r) // c)
+        if cx1 < 0 or cy1 < 0:
+            return []
+        r2 = r * r
+        if np is not None:
+            cx1 = min(cx1, self.gw - 1)
+            if cx0 > cx1:
+                return []
+            parts = []
+            for cy in range(cy0, cy1 + 1):
+                a, b = np.searchsorted(self.keys, (cy * self.gw + cx0, cy * self.gw + cx1 + 1))
+                if a < b:
+                    parts.append(self.order[a:b])
+            if not parts:
+                return []
+            idx = np.concatenate(parts)
+            dx = np.asarray(self.xs)[idx] - x
+            dy = np.asarray(self.ys)[idx] - y
+            return idx[dx * dx + dy * dy <= r2].tolist()
+        out = []
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                for i in self.cells.get((cx, cy), ()):
+                    dx, dy = self.xs[i] - x, self.ys[i] - y
+                    if dx * dx + dy * dy <= r2:
+                        out.append(i)
+        return out
+
+    def any_within(self, x, y, r) -> bool:
+        return bool(self.query(x, y, r))
+
+
+class Crowd:
+    """
+    Толпа бродячих агентов в виде структуры массивов: x, y, vx, vy, timer.
+    Агент идёт по прямой, раз в timer секунд берёт новое случайное направление
+    и скорость, в радиусе aggro подруливает к игроку и отскакивает от краёв.
+    С NumPy весь шаг векторный, без него — тот же алгоритм циклом.
+    После каждого step() агенты разложены по UniformGrid для запросов near().
+    """
+
+    STEER = 1500.0       # сила подруливания к игроку
+    MIN_AGGRO_SPEED = 60.0
+    MARGIN = 20          # отступ от краёв экрана
+
+    def __init__(self, n, rng, area, speed=(50, 210), change_dir=(0.8, 5.0), aggro_radius=400,
+                 grid_cell=64):
+        """area — (x0, y0, x1, y1), где появляются агенты; rng — random.Random сцены."""
+        self.n = n
+        self.rng = rng
+        self.min_speed, self.max_speed = speed
+        self.change_min, self.change_max = change_dir
+        self.aggro_radius = aggro_radius
+        self.grid = UniformGrid(grid_cell)
+        x0, y0, x1, y1 = area
+        if np is not None:
+            # свой генератор NumPy, но из сида сцены — прогоны воспроизводимы
+            self.np_rng = np.random.default_rng(rng.getrandbits(64))
+            self.x = self.np_rng.integers(x0, x1, n, endpoint=True).astype(np.float64)
+            self.y = self.np_rng.integers(y0, y1, n, endpoint=True).astype(np.float64)
+            self.vx = np.zeros(n)
+            self.vy = np.zeros(n)
+            self.timer = np.zeros(n)
+            self._redirect(np.ones(n, dtype=bool))
+        else:
+            self.x = [float(rng.randint(x0, x1)) for _ in range(n)]
+            self.y = [float(rng.randint(y0, y1)) for _ in range(n)]
+            self.vx, self.vy, self.timer = [0.0] * n, [0.0] * n, [0.0] * n
+            for i in range(n):
+                self._redirect_one(i)
+        self.grid.build(self.x, self.y)
+
+    # ---------- новое направление ----------
+    def _redirect(self, mask):
+        k = int(np.count_nonzero(mask))
+        if not k:
+            return
+        g = self.np_rng
+        d = g.uniform(-1, 1, (k, 2))
+        ln = np.hypot(d[:, 0], d[:, 1])
+        d[ln == 0] = (1.0, 0.0)
+        ln[ln == 0] = 1.0
+        spd = g.uniform(self.min_speed, self.max_speed, k) / ln
+        self.vx[mask] = d[:, 0] * spd
+        self.vy[mask] = d[:, 1] * spd
+        self.timer[mask] = g.uniform(self.change_min, self.change_max, k)
+
+    def _redirect_one(self, i):
+        rng = self.rng
+        dx, dy = rng.uniform(-1, 1), rng.uniform(-1, 1)
+        ln = math.hypot(dx, dy)
+        if ln == 0:
+            dx, dy, ln = 1.0, 0.0, 1.0
+        spd = rng.uniform(self.min_speed, self.max_speed) / ln
+        self.vx[i], self.vy[i] = dx * spd, dy * spd
+        self.timer[i] = rng.uniform(self.change_min, self.change_max)
+
+    # ---------- шаг ----------
+    def step(self, dt, px, py, w, h):
+        """Сдвинуть толпу на dt; (px, py) — игрок, w x h — экран."""
+        if np is not None:
+            self._step_np(dt, px, py, w, h)
+        else:
+            self._step_py(dt, px, py, w, h)
+        self.grid.build(self.x, self.y)
+
+    def _step_np(self, dt, px, py, w, h):
+        self.timer -= dt
+        self._redirect(self.timer <= 0)
+
+        # подруливание: к скорости добавляем STEER*dt в сторону игрока, модуль
+        # скорости сохраняем (но не ниже MIN_AGGRO_SPEED)
+        tx, ty = px - self.x, py - self.y
+        d2 = tx * tx + ty * ty
+        m = (d2 > 0) & (d2 < self.aggro_radius ** 2)
+        if m.any():
+            dist = np.sqrt(d2[m])
+            vx, vy = self.vx[m], self.vy[m]
+            spd = np.maximum(self.MIN_AGGRO_SPEED, np.hypot(vx, vy))
+            nx = vx + tx[m] / dist * self.STEER * dt
+            ny = vy + ty[m] / dist * self.STEER * dt
+            ln = np.hypot(nx, ny)
+            ln[ln == 0] = 1.0
+            self.vx[m] = nx / ln * spd
+            self.vy[m] = ny / ln * spd
+
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+        lo, hx, hy = self.MARGIN, w - self.MARGIN, h - self.MARGIN
+        bx = (self.x < lo) | (self.x > hx)
+        by = (self.y < lo) | (self.y > hy)
+        self.vx[bx] *= -1
+        self.vy[by] *= -1
+        b = bx | by
+        self.x[b] = np.clip(self.x[b], lo, hx)
+        self.y[b] = np.clip(self.y[b], lo, hy)
+
+    def _step_py(self, dt, px, py, w, h):
+        lo, hx, hy = self.MARGIN, w - self.MARGIN, h - self.MARGIN
+        r2 = self.aggro_radius ** 2
+        x, y, vx, vy, timer = self.x, self.y, self.vx, self.vy, self.timer
+        for i in range(self.n):
+            timer[i] -= dt
+            if timer[i] <= 0:
+                self._redirect_one(i)
+            tx, ty = px - x[i], py - y[i]
+            d2 = tx * tx + ty * ty
+            if 0 < d2 < r2:
+                dist = math.sqrt(d2)
+                spd = max(self.MIN_AGGRO_SPEED, math.hypot(vx[i], vy[i]))
+                nx = vx[i] + tx / dist * self.STEER * dt
+                ny = vy[i] + ty / dist * self.STEER * dt
+                ln = math.hypot(nx, ny) or 1.0
+                vx[i], vy[i] = nx / ln * spd, ny / ln * spd
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            bounced = False
+            if x[i] < lo or x[i] > hx:
+                vx[i] = -vx[i]; bounced = True
+            if y[i] < lo or y[i] > hy:
+                vy[i] = -vy[i]; bounced = True
+            if bounced:
+                x[i] = max(lo, min(hx, x[i]))
+                y[i] = max(lo, min(hy, y[i]))
+
+    # ---------- запросы ----------
+    def near(self, x, y, r) -> list[int]:
+        return self.grid.query(x, y, r)
+
+    def any_near(self, x, y, r) -> bool:
+        return self.grid.any_within(x, y, r)
+
+    def positions(self, dx=0, dy=0) -> list:
+        """[[x, y], ...] целыми пикселями со сдвигом — для blits()."""
+        if np is not None:
+            return np.stack((self.x + dx, self.y + dy), axis=1).astype(np.int32).tolist()
+        return [[int(x + dx), int(y + dy)] for x, y in zip(self.x, self.y)]
@@ -0,0 +1,333 @@
+import os, json, time, heapq, random, hashlib
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy generate() строит карту циклом по рядам — медленнее, но так же
+    np = None
+
+# клетки карты: '#' стена, '~' вода (медленно), 'S' старт, 'E' выход, остальное — пол
+WALL, SLOW, START, EXIT = '#', '~', 'S', 'E'
+# скорость по воде (MazeGame) и, соответственно, цена шага по ней для поля расстояний
+SLOW_FACTOR = 0.65
+STEP_COST = {SLOW: 1.0 / SLOW_FACTOR}
+
+# соседи клетки: (dx, dy) и имя направления как у AnimatedSprite
+NEIGHBOURS = ((1, 0, "right"), (-1, 0, "left"), (0, 1, "forward"), (0, -1, "back"))
+
+
+def load_level(path):
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [line.rstrip("\n") for line in f if line.strip()]
+    width = max(len(r) for r in rows)
+    rows = [r.ljust(width, "#") for r in rows]
+    return rows
+
+
+def find_tile(grid, ch):
+    """(x, y) первой клетки ch или None."""
+    for y, row in enumerate(grid):
+        x = row.find(ch)
+        if x != -1:
+            return x, y
+    return None
+
+
+class FieldBuilder:
+    """
+    Дейкстра от target по проходимым клеткам: цена клетки — время на ней,
+    1 для пола и 1/SLOW_FACTOR для воды. Считается порциями: step(max_pops)
+    можно звать по кадрам, не замораживая игру на больших картах.
+    Внутри — плоские списки по индексу y * w + x.
+    """
+
+    def __init__(self, grid, target):
+        self.h, self.w = len(grid), len(grid[0])
+        w = self.w
+        # цена входа в клетку; None — стена
+        self.cost = [None if ch == WALL else STEP_COST.get(ch, 1.0) for row in grid for ch in row]
+        self.flat = [None] * (w * self.h)
+        t = target[1] * w + target[0]
+        self.flat[t] = 0.0
+        self.heap = [(0.0, t)]
+
+    @property
+    def done(self) -> bool:
+        return not self.heap
+
+    def step(self, max_pops=None) -> bool:
+        """Обработать до max_pops клеток из очереди (None — до конца). True — поле готово."""
+        heap, flat, cost, w = self.heap, self.flat, self.cost, self.w
+        n = len(flat)
+        pop, push = heapq.heappop, heapq.heappush
+        left = max_pops if max_pops is not None else -1
+        while heap and left != 0:
+            left -= 1
+            d, i = pop(heap)
+            if d > flat[i]:
+                continue
+            x = i % w
+            # идём «назад» от выхода: платим за клетку, из которой шагнули бы в текущую
+            for j in (i + 1 if x + 1 < w else -1, i - 1 if x > 0 else -1, i + w, i - w):
+                if 0 <= j < n:
+                    c = cost[j]
+                    if c is not None:
+                        nd = d + c
+                        cur = flat[j]
+                        if cur is None or nd < cur:
+                            flat[j] = nd
+                            push(heap, (nd, j))
+        return not heap
+
+    def result(self):
+        """dist[y][x] (None — недостижимо)."""
+        w, f = self.w, self.flat
+        return [f[y * w:(y + 1) * w] for y in range(self.h)]
+
+
+def distance_field(grid, target):
+    """Поле расстояний до target целиком (см. FieldBuilder). Возвращает dist[y][x]."""
+    b = FieldBuilder(grid, target)
+    b.step()
+    return b.result()
+
+
+def _level_hash(grid):
+    h = hashlib.sha1("\n".join(grid).encode("utf-8"))
+    h.update(json.dumps(sorted(STEP_COST.items())).encode("utf-8"))
+    return h.hexdigest()
+
+
+def cache_path(level_path):
+    """Куда кладём поле расстояний: data/maze/maze1.txt -> data/maze/maze1.dist.json."""
+    return os.path.splitext(level_path)[0] + ".dist.json"
+
+
+class MazeLevel:
+    """
+    Карта лабиринта + поле расстояний до выхода.
+    Поле считается один раз и кэшируется рядом с файлом уровня
+    (перечитывается, только если карта или цены клеток поменялись).
+
+    lazy=True — поле не считается в конструкторе: его досчитывает advance()
+    порциями по кадрам; пока ready ложно, подсказки и прогресс пустые.
+    Для сгенерированных карт на лету: 2001x2001 считается секунды.
+    """
+
+    def __init__(self, grid, dist=None, path=None, lazy=False):
+        self.grid = grid
+        self.path = path
+        self.start = find_tile(grid, START)
+        self.exit = find_tile(grid, EXIT)
+        self._builder = None
+        self.dist = []
+        self.start_dist = None
+        if dist is not None:
+            self._set_dist(dist)
+        elif not self.exit:
+            self._set_dist([[None] * len(grid[0]) for _ in grid])
+        else:
+            self._builder = FieldBuilder(grid, self.exit)
+            if not lazy:
+                self.advance(None)
+
+    def _set_dist(self, dist):
+        self.dist = dist
+        self._builder = None
+        self.start_dist = self.distance(*self.start) if self.start else None
+
+    @property
+    def ready(self) -> bool:
+        return self._builder is None
+
+    def advance(self, budget=0.004) -> bool:
+        """Досчитать поле, потратив не больше budget секунд (None — до конца). True — готово."""
+        b = self._builder
+        if b is None:
+            return True
+        if budget is None:
+            b.step()
+        else:
+            deadline = time.perf_counter() + budget
+            while not b.step(2048) and time.perf_counter() < deadline:
+                pass
+        if b.done:
+            self._set_dist(b.result())
+        return b.done
+
+    @classmethod
+    def load(cls, path, use_cache=True):
+        grid = load_level(path)
+        digest = _level_hash(grid)
+        if use_cache:
+            try:
+                with open(cache_path(path), "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("sha1") == digest:
+                    return cls(grid, cached["dist"], path)
+            except (OSError, ValueError, KeyError):
+                pass
+        level = cls(grid, path=path)
+        if use_cache:
+            level.save_cache(digest)
+        return level
+
+    def save_cache(self, digest=None):
+        data = {"sha1": digest or _level_hash(self.grid),
+                "dist": [[None if d is None else round(d, 3) for d in row] for row in self.dist]}
+        try:
+            with open(cache_path(self.path), "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+        except OSError:
+            pass  # только для чтения — просто посчитаем в следующий раз
+
+    # ---------- запросы (всё O(1)) ----------
+    def distance(self, x, y):
+        if 0 <= y < len(self.dist) and 0 <= x < len(self.dist[y]):
+            return self.dist[y][x]
+        return None
+
+    def solvable(self) -> bool:
+        self.advance(None)
+        return self.start_dist is not None
+
+    def unreachable_floor(self):
+        """Проходимые клетки, из которых до выхода не дойти (оторванные куски карты)."""
+        self.advance(None)
+        return [(x, y) for y, row in enumerate(self.grid) for x, ch in enumerate(row)
+                if ch != WALL and self.dist[y][x] is None]
+
+    def hint(self, x, y):
+        """Куда шагнуть из клетки (x, y), чтобы быстрее всего дойти до выхода: (dx, dy, имя) или None."""
+        here = self.distance(x, y)
+        best = None
+        for dx, dy, name in NEIGHBOURS:
+            d = self.distance(x + dx, y + dy)
+            if d is not None and (here is None or d < here) and (best is None or d < best[0]):
+                best = (d, (dx, dy, name))
+        return best[1] if best else None
+
+    def progress(self, x, y) -> float:
+        """Доля пройденного пути 0..1 (по полю расстояний, не по прямой)."""
+        d = self.distance(x, y)
+        if d is None or not self.start_dist:
+            return 0.0
+        return max(0.0, min(1.0, 1.0 - d / self.start_dist))
+
+
+# ---------- генерация ----------
+# случайный байт < порога -> проход на восток, иначе конец «забега» (sidewinder, p = 0.5)
+_EAST_OR_CLOSE = bytes.maketrans(bytes(range(256)), b"." * 128 + b"#" * 128)
+_FLOOR_TO_WATER = bytes.maketrans(b".", SLOW.encode())
+
+
+def generate(width, height, seed=None, loops=0.05, water=0.03):
+    """
+    Случайная карта width x height клеток (чётные размеры округляются вверх до нечётных)
+    в формате data/maze: стены '#', пол '.', вода '~', 'S' слева сверху, 'E' справа снизу.
+    Одинаковый seed — одинаковая карта.
+
+    Основа — sidewinder: он даёт идеальный лабиринт (от любой клетки ровно один путь
+    наверх), так что выход всегда достижим. С NumPy вся карта строится массивами
+    (2000x2000 — десятки миллисекунд), без него — построчно срезами bytearray;
+    карты одного seed в этих двух режимах разные.
+    loops — доля клеток, у которых сносится случайная стенка (появляются петли),
+    water — примерная доля пола под лужами '~'.
+    """
+    w, h = max(5, width | 1), max(5, height | 1)
+    if np is not None:
+        grid = _generate_np(w, h, seed, loops, water)
+    else:
+        grid = _generate_py(w, h, seed, loops, water)
+    grid[w + 1] = ord(START)
+    grid[(h - 2) * w + w - 2] = ord(EXIT)
+    return [grid[y * w:(y + 1) * w].decode("ascii") for y in range(h)]
+
+
+def _generate_np(w, h, seed, loops, water) -> bytearray:
+    rng = np.random.default_rng(seed)
+    cw, ch = (w - 1) // 2, (h - 1) // 2
+    wall, floor = ord("#"), ord(".")
+    grid = np.full((h, w), wall, np.uint8)
+
+    # ряды клеток собираем в непрерывном буфере (запись через двойной шаг по grid
+    # заметно медленнее): клетки — пол, между ними проход на восток с вероятностью 1/2,
+    # верхний ряд — сплошной коридор
+    n = ch * (cw - 1)
+    east = np.unpackbits(np.frombuffer(rng.bytes((n + 7) // 8), np.uint8),
+                         count=n).reshape(ch, cw - 1).view(bool)
+    east[0] = True
+    rows = np.full((ch, w), floor, np.uint8)
+    rows[:, 0] = rows[:, -1] = wall
+    rows[:, 2:w - 1:2] = wall + (floor - wall) * east.view(np.uint8)
+    grid[1:2 * ch:2] = rows
+
+    # из каждого забега (отрезка между закрытыми стенками) кроме верхнего ряда —
+    # один проход наверх в случайной клетке забега; ряды склеены в один плоский массив
+    start = np.ones((ch - 1, cw), bool)
+    start[:, 1:] = ~east[1:]
+    first = np.flatnonzero(start)
+    length = np.diff(np.append(first, start.size))
+    pick = first + (rng.random(first.size, np.float32) * length).astype(np.int32)
+    north = np.zeros(start.size, np.uint8)
+    north[pick] = floor - wall
+    grid[2:2 * ch:2, 1:w - 1:2] += north.reshape(ch - 1, cw)
+
+    # петли: сносим случайные стенки между соседними клетками
+    k = int(loops * cw * ch)
+    horiz = rng.random(k) < 0.5
+    xs = np.where(horiz, 2 + 2 * rng.integers(0, cw - 1, k), 1 + 2 * rng.integers(0, cw, k))
+    ys = np.where(horiz, 1 + 2 * rng.integers(0, ch, k), 2 + 2 * rng.integers(0, ch - 1, k))
+    grid[ys, xs] = ord(".")
+
+    # вода: квадратные лужи радиуса 1..2 по внутренней области, стены не трогаем
+    k = int(water * w * h / 17)
+    wet = np.zeros((h, w), bool)
+    r = rng.integers(1, 3, k)
+    x0, y0 = rng.integers(1, w - 1, k), rng.integers(1, h - 1, k)
+    for rad in (1, 2):
+        sel = r == rad
+        for dy in range(-rad, rad + 1):
+            for dx in range(-rad, rad + 1):
+                wet[np.clip(y0[sel] + dy, 0, h - 1), np.clip(x0[sel] + dx, 0, w - 1)] = True
+    wet[[0, -1], :] = wet[:, [0, -1]] = False
+    grid += (ord(SLOW) - floor) * (wet & (grid == floor)).view(np.uint8)
+    return bytearray(grid.tobytes())
+
+
+def _generate_py(w, h, seed, loops, water) -> bytearray:
+    rng = random.Random(seed)
+    cw, ch = (w - 1) // 2, (h - 1) // 2
+    grid = bytearray(b"#") * (w * h)
+    cells = bytearray(b"#") * w
+    cells[1:w - 1:2] = b"." * cw
+
+    for cy in range(ch):
+        r0 = (2 * cy + 1) * w
+        row = bytearray(cells)
+        # верхний ряд — сплошной коридор, ниже — случайные проходы на восток
+        row[2:w - 1:2] = b"." * (cw - 1) if cy == 0 else rng.randbytes(cw - 1).translate(_EAST_OR_CLOSE)
+        grid[r0:r0 + w] = row
+        if cy:
+            # из каждого забега (отрезка между стенками) пробиваем один проход наверх
+            x = 1
+            for run in bytes(row[1:w - 1]).split(b"#"):
+                grid[r0 - w + x + 2 * int(rng.random() * ((len(run) + 1) // 2))] = 46  # '.'
+                x += len(run) + 1
+
+    # петли: сносим случайные стенки между соседними клетками
+    for _ in range(int(loops * cw * ch)):
+        if rng.random() < 0.5:
+            x, y = 2 + 2 * rng.randrange(cw - 1), 1 + 2 * rng.randrange(ch)
+        else:
+            x, y = 1 + 2 * rng.randrange(cw), 2 + 2 * rng.randrange(ch - 1)
+        grid[y * w + x] = 46
+
+    # вода: квадратные лужи радиуса 1..2, стены не трогаем; в среднем ~17 клеток на лужу,
+    # из них пол — около половины, так что water ~ доля пола под водой
+    for _ in range(int(water * w * h / 17)):
+        r = rng.randint(1, 2)
+        x0, y0 = rng.randrange(1, w - 1), rng.randrange(1, h - 1)
+        xa, xb = max(1, x0 - r), min(w - 1, x0 + r + 1)
+        for y in range(max(1, y0 - r), min(h - 1, y0 + r + 1)):
+            grid[y * w + xa:y * w + xb] = grid[y * w + xa:y * w + xb].translate(_FLOOR_TO_WATER)
+    return grid
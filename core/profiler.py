@@ -0,0 +1,115 @@
+import os, csv, time
+from collections import deque
+import pygame as pg
+from core.resources import font
+
+PHASES = ("event", "update", "draw", "flip")
+
+
+def percentile(sorted_vals, q):
+    """q-й перцентиль (0..100) уже отсортированного списка, с интерполяцией."""
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+class FrameProfiler:
+    """
+    Замер времени кадра по фазам (event / update / draw / flip),
+    с пометкой активной сцены. Держит скользящее окно на сцену для
+    p50/p95/p99, рисует оверлей с графиком (F3) и при выходе пишет CSV.
+    """
+
+    def __init__(self, window=600, out_dir="profiles"):
+        self.window = window
+        self.out_dir = out_dir
+        self.overlay = False
+        self.frames = []                        # все кадры сессии для CSV
+        self.recent: dict[str, deque] = {}      # сцена -> последние total (мс)
+        self.graph = deque(maxlen=240)          # последние кадры для графика
+        self.started = time.strftime("%Y%m%d_%H%M%S")
+        self._scene = ""
+        self._t0 = self._t = 0.0
+        self._laps = {}
+
+    # ---------- замер ----------
+    def begin_frame(self, scene_name: str):
+        self._scene = scene_name
+        self._t0 = self._t = time.perf_counter()
+        self._laps = {}
+
+    def lap(self, phase: str):
+        """Закрыть фазу: время с прошлой отметки записывается в неё."""
+        now = time.perf_counter()
+        self._laps[phase] = (now - self._t) * 1000.0
+        self._t = now
+
+    def end_frame(self):
+        total = (self._t - self._t0) * 1000.0
+        row = (len(self.frames), self._scene, *(self._laps.get(p, 0.0) for p in PHASES), total)
+        self.frames.append(row)
+        self.recent.setdefault(self._scene, deque(maxlen=self.window)).append(total)
+        self.graph.append((self._laps.get("update", 0.0), self._laps.get("draw", 0.0), total))
+
+    # ---------- статистика ----------
+    def stats(self, scene_name: str | None = None) -> dict:
+        vals = sorted(self.recent.get(scene_name or self._scene, ()))
+        return {"frames": len(vals), "p50": percentile(vals, 50),
+                "p95": percentile(vals, 95), "p99": percentile(vals, 99)}
+
+    def summary(self) -> dict:
+        """Перцентили за всю сессию по каждой сцене."""
+        per_scene: dict[str, list[float]] = {}
+        for row in self.frames:
+            per_scene.setdefault(row[1], []).append(row[-1])
+        out = {}
+        for name, vals in per_scene.items():
+            vals.sort()
+            out[name] = {"frames": len(vals), "p50": percentile(vals, 50),
+                         "p95": percentile(vals, 95), "p99": percentile(vals, 99)}
+        return out
+
+    # ---------- оверлей ----------
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+
+    def draw_overlay(self, surface: pg.Surface, budget_ms: float = 1000.0 / 60):
+        w, h = 250, 118
+        x0, y0 = surface.get_width() - w - 10, surface.get_height() - h - 10
+        panel = pg.Surface((w, h), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        surface.blit(panel, (x0, y0))
+
+        # график: столбик на кадр, update — зелёный, draw — синий, остальное — серый
+        gx, gy, gh = x0 + 5, y0 + h - 5, 60
+        scale = gh / (budget_ms * 2)
+        for i, (upd, drw, total) in enumerate(self.graph):
+            x = gx + i
+            hu, hd, ht = int(upd * scale), int(drw * scale), min(gh, int(total * scale))
+            pg.draw.line(surface, (90, 90, 100), (x, gy), (x, gy - ht))
+            pg.draw.line(surface, (120, 220, 140), (x, gy), (x, gy - min(gh, hu)))
+            pg.draw.line(surface, (120, 160, 255), (x, gy - hu), (x, gy - min(gh, hu + hd)))
+        budget_y = gy - int(budget_ms * scale)
+        pg.draw.line(surface, (255, 120, 110), (gx, budget_y), (gx + self.graph.maxlen - 1, budget_y))
+
+        st = self.stats()
+        f = font("better-vcr-5.2.ttf", 14)
+        surface.blit(f.render(self._scene, True, (230, 230, 240)), (x0 + 6, y0 + 5))
+        line = f"p50 {st['p50']:.1f}  p95 {st['p95']:.1f}  p99 {st['p99']:.1f} мс"
+        surface.blit(f.render(line, True, (230, 230, 240)), (x0 + 6, y0 + 23))
+
+    # ---------- CSV ----------
+    def dump_csv(self) -> str | None:
+        if not self.out_dir or not self.frames:
+            return None
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"frames_{self.started}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            wr = csv.writer(f)
+            wr.writerow(("frame", "scene", *(f"{p}_ms" for p in PHASES), "total_ms"))
+            for row in self.frames:
+                wr.writerow((row[0], row[1], *(f"{v:.3f}" for v in row[2:])))
+        return path
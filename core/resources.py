@@ -1,23 +1,408 @@
 import pygame as pg
 import json
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# бюджет кэша картинок по умолчанию (байты, считаем как pitch * height)
+IMG_CACHE_BUDGET = 192 * 1024 * 1024
+# сколько потоков декодируют картинки в фоне
+IMG_LOADER_THREADS = 2
+
+
+class SurfaceCache:
+    """
+    LRU-кэш поверхностей с бюджетом по памяти.
+    Размер поверхности = pitch * height (реальный объём пикселей).
+    Закреплённые (pinned) ключи не вытесняются, даже если бюджет превышен.
+    Ключ-кортеж (имя, ...) — вариант картинки; он закреплён вместе с именем.
+    """
+
+    def __init__(self, budget: int = IMG_CACHE_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self._items: OrderedDict = OrderedDict()   # key -> (surface, nbytes)
+        self._pins: dict = {}                       # key -> счётчик закреплений
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def surface_bytes(surf: pg.Surface) -> int:
+        return surf.get_pitch() * surf.get_height()
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def put(self, key, surf: pg.Surface):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.used -= old[1]
+        nbytes = self.surface_bytes(surf)
+        self._items[key] = (surf, nbytes)
+        self.used += nbytes
+        self._evict()
+        return surf
+
+    def pin(self, key):
+        self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key):
+        n = self._pins.get(key, 0) - 1
+        if n > 0:
+            self._pins[key] = n
+        else:
+            self._pins.pop(key, None)
+            self._evict()
+
+    def unpin_all(self):
+        self._pins.clear()
+        self._evict()
+
+    def set_budget(self, budget: int):
+        self.budget = budget
+        self._evict()
+
+    def clear(self):
+        self._items.clear()
+        self.used = 0
+
+    def _evict(self):
+        if self.used <= self.budget:
+            return
+        # идём от самых старых; закреплённые пропускаем
+        for key in list(self._items.keys()):
+            if self.used <= self.budget:
+                break
+            if self._pinned(key):
+                continue
+            _surf, nbytes = self._items.pop(key)
+            self.used -= nbytes
+            self.evictions += 1
+
+    def _pinned(self, key) -> bool:
+        if key in self._pins:
+            return True
+        return isinstance(key, tuple) and key[0] in self._pins
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "items": len(self._items), "pinned": len(self._pins),
+            "used": self.used, "budget": self.budget,
+        }
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+_ASSET_CACHE = {"img": SurfaceCache(), "font":{}, "sfx":{}, "music":{}}
+
+class AssetIndex:
+    """
+    Индекс файлов ассетов: один проход по assets/img и data при старте,
+    дальше любой поиск — это просто обращение к dict, без syscalls.
+    Имя ищется так же, как раньше перебором: сначала как есть,
+    затем внутри папок глав (ch1/..ch4/). Если одно и то же имя лежит
+    в нескольких главах — это неоднозначность, о ней сообщаем сразу.
+    """
+    CHAPTER_DIRS = ('ch1', 'ch2', 'ch3', 'ch4')
+
+    def __init__(self, root):
+        self.root = root
+        self.paths: dict[str, str] = {}            # имя -> путь на диске
+        self.dirs: dict[str, list[str]] = {}       # папка -> имена файлов в ней
+        self.ambiguous: dict[str, list[str]] = {}  # имя -> все кандидаты
+        self._build()
+
+    def _build(self):
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames.sort()
+            rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            rel_dir = '' if rel_dir == '.' else rel_dir
+            self.dirs[rel_dir] = sorted(filenames)
+            for fn in filenames:
+                rel = f"{rel_dir}/{fn}" if rel_dir else fn
+                files.append((rel, os.path.join(dirpath, fn)))
+
+        # точные пути имеют приоритет над «короткими» именами из глав
+        for rel, path in files:
+            self.paths[rel] = path
+        short: dict[str, list[tuple[str, str]]] = {}
+        for rel, path in files:
+            head, _, tail = rel.partition('/')
+            if head in self.CHAPTER_DIRS and tail:
+                short.setdefault(tail, []).append((head, path))
+        for name, found in short.items():
+            found.sort()  # порядок глав ch1 < ch2 < ...
+            if len(found) > 1:
+                self.ambiguous[name] = [p for _h, p in found]
+            if name not in self.paths:
+                self.paths[name] = found[0][1]
+
+    def find(self, name):
+        return self.paths.get(name.replace('\\', '/'))
+
+    def listdir(self, folder):
+        return self.dirs.get(folder.strip('/'), [])
+
+
+_INDEX: dict[str, AssetIndex] = {}
+
+def asset_index(kind):
+    """Индекс для 'img' (assets/img) или 'data' (data/), строится один раз."""
+    index = _INDEX.get(kind)
+    if index is None:
+        root = os.path.join('assets', 'img') if kind == 'img' else 'data'
+        index = _INDEX[kind] = AssetIndex(root)
+        for name, paths in index.ambiguous.items():
+            print(f"Asset index: '{name}' is ambiguous, using {paths[0]} (also: {', '.join(paths[1:])})")
+    return index
+
+def _find_img(name):
+    path = asset_index('img').find(name)
+    if path is None:
+        raise FileNotFoundError(f"Image not found: {name}")
+    return path
+
+def _load_converted(path, alpha=True):
+    surf = pg.image.load(path)
+    return surf.convert_alpha() if alpha else surf.convert()
 
-_ASSET_CACHE = {"img":{}, "font":{}, "sfx":{}, "music":{}}
 def img(name):
-    # If name contains a path delimiter, use it directly
-    for subdir in ['', 'ch1/', 'ch2/', 'ch3/', 'ch4/']:
-        path = os.path.join('assets', 'img', subdir + name)
-        if os.path.exists(path):
-            return pg.image.load(path).convert_alpha()
-    raise FileNotFoundError(f"Image not found: {name}")
+    cache = _ASSET_CACHE["img"]
+    surf = cache.get(name)
+    if surf is None:
+        surf = cache.put(name, _load_converted(_find_img(name)))
+    return surf
+
+# ---------- запечённые варианты (tools/bake_assets.py) ----------
+BUILD_DIR = os.path.join('build', 'assets')
+
+_BAKED: dict | None = None
+_SIZES: dict = {}   # (имя, size с None) -> итоговый (w, h)
+
+def baked_manifest() -> dict:
+    """Манифест запечённых картинок: путь исходника -> размеры и варианты."""
+    global _BAKED
+    if _BAKED is None:
+        _BAKED = {}
+        try:
+            with open(os.path.join(BUILD_DIR, 'manifest.json'), 'r', encoding='utf-8') as f:
+                items = json.load(f).get("items", {})
+        except (OSError, ValueError):
+            items = {}
+        for item in items.values():
+            entry = _BAKED.setdefault(item["src"], {"src_size": tuple(item["src_size"]), "variants": {}})
+            entry["variants"][tuple(item["size"])] = (os.path.join(BUILD_DIR, item["out"]), item["alpha"])
+    return _BAKED
+
+def _baked_entry(name):
+    index = asset_index('img')
+    path = index.find(name)
+    if path is None:
+        return None
+    rel = os.path.relpath(path, index.root).replace(os.sep, '/')
+    return baked_manifest().get(rel)
+
+def img_size(name):
+    """Размер исходника картинки; из манифеста запечённых, чтобы не декодировать его зря."""
+    entry = _baked_entry(name)
+    return entry["src_size"] if entry else img(name).get_size()
+
+def _resolve_size(name, size):
+    w, h = size
+    if w is not None and h is not None:
+        return (w, h)
+    resolved = _SIZES.get((name, size))
+    if resolved is None:
+        sw, sh = img_size(name)
+        if w is None:
+            w = max(1, int(sw * (h / sh)))
+        else:
+            h = max(1, int(sh * (w / sw)))
+        resolved = _SIZES[(name, size)] = (w, h)
+    return resolved
+
+def _baked_variant(name, size):
+    entry = _baked_entry(name)
+    if entry is None:
+        return None
+    return entry["variants"].get(_resolve_size(name, size))
+
+def img_scaled(name, size, smooth=True):
+    """
+    Картинка, заранее приведённая к размеру size=(w, h).
+    Одна из сторон может быть None — тогда она считается по пропорциям.
+    Масштабирование выполняется один раз на (имя, размер, фильтр).
+    Если в build/assets есть запечённый вариант нужного размера — берём его
+    (он уже сглажен, поэтому подходит для любого фильтра).
+    """
+    w, h = _resolve_size(name, size)
+    key = (name, (w, h), bool(smooth))
+    cache = _ASSET_CACHE["img"]
+    surf = cache.get(key)
+    if surf is None:
+        baked = _baked_variant(name, (w, h))
+        if baked is not None:
+            surf = _load_converted(*baked)
+        else:
+            src = img(name)
+            if src.get_size() == (w, h):
+                # исходник уже нужного размера и лежит в кэше под своим именем:
+                # второй ключ на ту же поверхность посчитал бы её байты дважды
+                return src
+            if smooth:
+                surf = pg.transform.smoothscale(src, (w, h))
+            else:
+                surf = pg.transform.scale(src, (w, h))
+        cache.put(key, surf)
+    return surf
+
+class ImageHandle:
+    """
+    Ручка на картинку, которая грузится в фоне (см. img_async).
+    Декодирование PNG идёт в пуле потоков, а convert() —
+    только в главном потоке, при первом обращении после готовности.
+    Пока картинка не готова, get() отдаёт заглушку.
+    """
+
+    def __init__(self, name, future=None, *, key=None, size=None, smooth=True, alpha=True):
+        self.name = name
+        self.key = key if key is not None else name
+        self.size = size
+        self.smooth = smooth
+        self.alpha = alpha
+        self._future = future
+        self.error = None
+
+    @property
+    def ready(self) -> bool:
+        if self._future is None:
+            return self.error is None
+        if not self._future.done():
+            return False
+        self._resolve()
+        return self.error is None
+
+    @property
+    def done(self) -> bool:
+        """Загрузка завершена — успешно или с ошибкой (см. error)."""
+        return self.ready or self.error is not None
+
+    def _resolve(self):
+        future, self._future = self._future, None
+        _PENDING.pop(self.key, None)
+        try:
+            raw = future.result()
+        except Exception as e:
+            self.error = e
+            return
+        if self.key not in _ASSET_CACHE["img"]:
+            surf = raw.convert_alpha() if self.alpha else raw.convert()
+            _ASSET_CACHE["img"].put(self.key, surf)
+
+    def get(self, placeholder_surf=None):
+        """Готовая картинка или заглушка (None, если заглушку не передали)."""
+        if self.ready:
+            if self.size is not None:
+                return img_scaled(self.name, self.size, self.smooth)
+            return img(self.name)
+        return placeholder_surf
+
+    def wait(self):
+        """Дождаться загрузки (блокирует главный поток)."""
+        if self._future is not None:
+            self._future.exception()  # ждёт завершения, не бросая исключение
+        return self.get()
+
+
+_PENDING: dict = {}
+_LOADER: ThreadPoolExecutor | None = None
+
+def _decode(path):
+    # без convert: к дисплею привязываемся уже в главном потоке
+    return pg.image.load(path)
+
+def img_async(name, size=None, smooth=True) -> ImageHandle:
+    """
+    Начать фоновую загрузку картинки; повторные вызовы не дублируют работу.
+    С size сразу грузится запечённый вариант этого размера, если он есть.
+    """
+    global _LOADER
+    baked = _baked_variant(name, size) if size is not None else None
+    if baked is not None:
+        key = (name, _resolve_size(name, size), bool(smooth))
+        path, alpha = baked
+    else:
+        key, path, alpha = name, asset_index('img').find(name), True
+    opts = dict(key=key, size=size, smooth=smooth, alpha=alpha)
+
+    handle = _PENDING.get(key)
+    if handle is not None:
+        return handle
+    if key in _ASSET_CACHE["img"]:
+        return ImageHandle(name, **opts)
+    if path is None:
+        handle = ImageHandle(name, **opts)
+        handle.error = FileNotFoundError(f"Image not found: {name}")
+        return handle
+    if _LOADER is None:
+        _LOADER = ThreadPoolExecutor(max_workers=IMG_LOADER_THREADS,
+                                     thread_name_prefix="img-loader")
+    handle = _PENDING[key] = ImageHandle(name, _LOADER.submit(_decode, path), **opts)
+    return handle
+
+def poll_async():
+    """Перенести все догрузившиеся в фоне картинки в кэш (раз за кадр)."""
+    for handle in list(_PENDING.values()):
+        handle.ready
+
+def placeholder(size, color=(0, 0, 0)):
+    """Дешёвая однотонная заглушка заданного размера (кэшируется)."""
+    key = ("__placeholder__", tuple(size), tuple(color))
+    cache = _ASSET_CACHE["img"]
+    surf = cache.get(key)
+    if surf is None:
+        surf = pg.Surface(size).convert()
+        surf.fill(color)
+        cache.put(key, surf)
+    return surf
+
+def pin_img(name):
+    """Закрепить картинку (и её масштабированные варианты) в кэше."""
+    _ASSET_CACHE["img"].pin(name)
+
+def unpin_img(name):
+    _ASSET_CACHE["img"].unpin(name)
+
+def unpin_all_img():
+    _ASSET_CACHE["img"].unpin_all()
+
+def set_img_budget(nbytes):
+    """Задать бюджет кэша картинок в байтах."""
+    _ASSET_CACHE["img"].set_budget(int(nbytes))
+
+def img_cache_stats():
+    """Счётчики кэша картинок: hits/misses/evictions, занято/бюджет."""
+    return _ASSET_CACHE["img"].stats()
 
 def load_json(filename):
-    for subdir in ['', 'ch1/', 'ch2/', 'ch3/', 'ch4/']:
-        path = os.path.join('data', subdir + filename)
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    raise FileNotFoundError(f"JSON not found: {filename}")
+    path = asset_index('data').find(filename)
+    if path is None:
+        raise FileNotFoundError(f"JSON not found: {filename}")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def font(name, size):
     key = (name,size)
@@ -29,4 +414,4 @@ def sfx(path):
     """Загрузить короткий звук (WAV/OGG) из assets/sfx/"""
     if path not in _ASSET_CACHE["sfx"]:
         _ASSET_CACHE["sfx"][path] = pg.mixer.Sound(os.path.join("assets", "sfx", path))
-    return _ASSET_CACHE["sfx"][path]
\ No newline at end of file
+    return _ASSET_CACHE["sfx"][path]
@@ -1,20 +1,156 @@
+import pygame as pg
 from core.ui import TOASTS
+from core.resources import unpin_all_img, poll_async, img_async
+from core.text import render
+
+
+def merge_rects(rects):
+    """Склеивает пересекающиеся прямоугольники, чтобы не обновлять области дважды."""
+    merged = []
+    for r in rects:
+        r = pg.Rect(r)
+        i = r.collidelist(merged)
+        while i != -1:
+            r.union_ip(merged.pop(i))
+            i = r.collidelist(merged)
+        merged.append(r)
+    return merged
+
 
 class SceneManager:
-    def __init__(self, screen, start_scene):
+    def __init__(self, screen, start_scene, dirty_rects=False, full_flip_ratio=0.5):
         self.screen = screen
+        # режим «грязных прямоугольников»: на экран выводим только изменившееся
+        self.dirty_rects = dirty_rects
+        # если грязная площадь больше этой доли экрана — проще сделать flip()
+        self.full_flip_ratio = full_flip_ratio
+        self._toasts_shown = False
+        self._preloads = {}      # (класс сцены, kwargs) -> ручки фоновой загрузки
+        self._pending = None     # отложенный switch: (класс, kwargs, ручки)
+        self._pool = {}          # класс -> (сцена, kwargs) для повторного входа через reset()
+        self._scene_kwargs = {}
         self.scene = start_scene(self)
 
+    # ---------- переходы ----------
+    @staticmethod
+    def _key(scene_cls, kwargs):
+        # простые значения сравниваем по значению, объекты (state) — по идентичности
+        return scene_cls, tuple(sorted(
+            (k, v if isinstance(v, (str, int, float, bool, type(None))) else id(v))
+            for k, v in kwargs.items()))
+
+    def preload(self, scene_cls, **kwargs):
+        """
+        Начать фоновую загрузку ресурсов сцены заранее (например, пока идёт кат-сцена).
+        Список ресурсов сцена отдаёт из classmethod preload_assets(screen_size, **kwargs).
+        """
+        key = self._key(scene_cls, kwargs)
+        if key not in self._preloads:
+            specs = scene_cls.preload_assets(self.screen.get_size(), **kwargs)
+            self._preloads[key] = [img_async(*s) if isinstance(s, tuple) else img_async(s)
+                                   for s in specs]
+        return self._preloads[key]
+
     def switch(self, scene_cls, **kwargs):
-        self.scene = scene_cls(self, **kwargs)
+        """
+        Перейти в сцену. Если её ресурсы ещё грузятся — переход откладывается,
+        а до готовности показывается экран загрузки с прогрессом.
+        """
+        handles = self.preload(scene_cls, **kwargs)
+        if all(h.done for h in handles):
+            self._enter(scene_cls, kwargs)
+        else:
+            self._pending = (scene_cls, kwargs, handles)
+
+    def _enter(self, scene_cls, kwargs):
+        self._pending = None
+        # предзагрузки прошлой сцены больше не нужны; новая закажет свои
+        self._preloads.clear()
+        # сцену с reset() не выбрасываем: повторный вход (ретрай) её переиспользует
+        old = self.scene
+        if hasattr(old, "reset"):
+            self._pool[type(old)] = (old, self._scene_kwargs)
+        # картинки прошлой сцены больше не закреплены — их можно вытеснять
+        unpin_all_img()
+        pooled = self._pool.pop(scene_cls, None)
+        if pooled is not None and pooled[1] == kwargs:
+            scene = pooled[0]
+            scene.reset()
+            scene.invalidate()
+        else:
+            scene = scene_cls(self, **kwargs)
+        self.scene = scene
+        self._scene_kwargs = kwargs
+        self._prune_pool(scene)
 
+    def _prune_pool(self, scene):
+        """
+        В пуле держим сцену, только пока к ней можно вернуться: это текущая сцена
+        или та, куда ведёт текущая кат-сцена (ретрай). Ушли из главы — выбрасываем.
+        """
+        keep = {type(scene)} | {cls for cls, _kwargs in scene.next_targets()}
+        for cls in [c for c in self._pool if c not in keep]:
+            del self._pool[cls]
+
+    @property
+    def loading(self) -> float | None:
+        """Прогресс отложенного перехода (0..1) или None, если ничего не ждём."""
+        if self._pending is None:
+            return None
+        handles = self._pending[2]
+        return sum(1 for h in handles if h.done) / max(1, len(handles))
+
+    # ---------- цикл ----------
     def handle_event(self, event):
-        self.scene.handle_event(event)
+        if self._pending is None:
+            self.scene.handle_event(event)
 
     def update(self, dt):
+        poll_async()
+        if self._pending is not None:
+            # старая сцена уже попросила переход — дальше её не обновляем
+            if self.loading >= 1.0:
+                self._enter(*self._pending[:2])
+            return
         self.scene.update(dt)
         TOASTS.update(dt)
 
-    def draw(self):
-        self.scene.draw()
+    def draw(self, interp=1.0):
+        """
+        Рисует кадр и возвращает, что вывести на дисплей:
+        None — весь экран (flip), список pg.Rect — только эти области.
+        interp — доля шага симуляции (0..1) для интерполяции, см. FixedTimestep.
+        """
+        self.scene.interp = interp
+        if self._pending is not None:
+            self._draw_loading()
+            return None
+        toasts = bool(TOASTS.items)
+        if not self.dirty_rects or toasts or self._toasts_shown:
+            # тосты рисуются поверх сцены — под ними её нужно перерисовать
+            self.scene.invalidate()
+        self._toasts_shown = toasts
+
+        rects = self.scene.draw()
+        self.scene.full_redraw = False
         TOASTS.draw(self.screen)
+
+        if not self.dirty_rects or rects is None or toasts:
+            return None
+        rects = merge_rects(rects)
+        area = sum(r.w * r.h for r in rects)
+        if area > self.full_flip_ratio * self.screen.get_width() * self.screen.get_height():
+            return None
+        return rects
+
+    def _draw_loading(self):
+        w, h = self.screen.get_size()
+        self.screen.fill((12, 12, 16))
+        label = render("Загрузка…", 24, (220, 220, 230), font_name="better-vcr-5.2.ttf")
+        self.screen.blit(label, label.get_rect(center=(w // 2, h // 2 - 24)))
+        bar = pg.Rect(0, 0, 320, 12)
+        bar.center = (w // 2, h // 2 + 12)
+        pg.draw.rect(self.screen, (50, 58, 66), bar, border_radius=4)
+        fill = bar.copy()
+        fill.width = int(bar.width * (self.loading or 0.0))
+        pg.draw.rect(self.screen, (120, 220, 140), fill, border_radius=4)
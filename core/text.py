@@ -0,0 +1,124 @@
+import pygame as pg
+from collections import OrderedDict
+from core.resources import SurfaceCache, font
+
+# сколько готовых раскладок текста держим в кэше
+LAYOUT_CACHE_SIZE = 256
+# бюджет кэша отрендеренных строк (байты)
+TEXT_CACHE_BUDGET = 8 * 1024 * 1024
+
+
+def wrap_words(text: str, fnt: pg.font.Font, max_w: int) -> list[str]:
+    """
+    Перенос по словам: ширину меряем через Font.size, без рендера.
+    Слово, которое само шире max_w, остаётся на отдельной строке.
+    """
+    lines = []
+    line = ""
+    for w in str(text).split():
+        test = (line + " " + w).strip()
+        if fnt.size(test)[0] > max_w and line:
+            lines.append(line)
+            line = w
+        else:
+            line = test
+    if line:
+        lines.append(line)
+    return lines
+
+
+class TextLayout:
+    """Сверстанный блок текста: отрендеренные строки и их смещения."""
+
+    def __init__(self, surfaces: list[pg.Surface], offsets: list[tuple[int, int]], size: tuple[int, int]):
+        self.surfaces = surfaces
+        self.offsets = offsets
+        self.size = size
+
+    def blit(self, surface: pg.Surface, pos):
+        x, y = pos
+        for surf, (dx, dy) in zip(self.surfaces, self.offsets):
+            surface.blit(surf, (x + dx, y + dy))
+
+
+_LAYOUTS: OrderedDict = OrderedDict()
+_STATS = {"hits": 0, "misses": 0}
+
+
+def layout(text, fnt: pg.font.Font, max_w: int, color=(255, 255, 255), *,
+           align: str = "left", line_height: int | None = None,
+           line_spacing: float = 1.0, antialias: bool = True) -> TextLayout:
+    """
+    Раскладка текста по ширине max_w с кэшем по (текст, шрифт, ширина, цвет, ...).
+    align: "left" | "center" | "right" внутри max_w.
+    line_height задаёт шаг строк в пикселях; иначе — высота шрифта * line_spacing.
+    """
+    key = (str(text), fnt, max_w, tuple(color), align, line_height, line_spacing, antialias)
+    lay = _LAYOUTS.get(key)
+    if lay is not None:
+        _LAYOUTS.move_to_end(key)
+        _STATS["hits"] += 1
+        return lay
+    _STATS["misses"] += 1
+
+    step = line_height if line_height is not None else int(fnt.get_height() * line_spacing)
+    surfaces, offsets = [], []
+    y = 0
+    for line in wrap_words(text, fnt, max_w):
+        surf = fnt.render(line, antialias, color)
+        if align == "center":
+            dx = (max_w - surf.get_width()) // 2
+        elif align == "right":
+            dx = max_w - surf.get_width()
+        else:
+            dx = 0
+        surfaces.append(surf)
+        offsets.append((dx, y))
+        y += step
+    height = (y - step + surfaces[-1].get_height()) if surfaces else 0
+    lay = TextLayout(surfaces, offsets, (max_w, height))
+
+    _LAYOUTS[key] = lay
+    if len(_LAYOUTS) > LAYOUT_CACHE_SIZE:
+        _LAYOUTS.popitem(last=False)
+    return lay
+
+
+def layout_stats() -> dict:
+    return {"hits": _STATS["hits"], "misses": _STATS["misses"], "items": len(_LAYOUTS)}
+
+
+# ---------- общий сервис рендера строк ----------
+_SYS_FONTS: dict = {}
+_RENDERED = SurfaceCache(TEXT_CACHE_BUDGET)
+
+
+def get_font(size: int, font_name: str | None = None) -> pg.font.Font:
+    """
+    Шрифт нужного размера, создаётся один раз.
+    font_name=None — системный шрифт по умолчанию (как pg.font.SysFont(None, size)),
+    иначе файл из assets/fonts.
+    """
+    if font_name is not None:
+        return font(font_name, size)
+    fnt = _SYS_FONTS.get(size)
+    if fnt is None:
+        fnt = _SYS_FONTS[size] = pg.font.SysFont(None, size)
+    return fnt
+
+
+def render(text, size: int, color=(255, 255, 255), *, font_name: str | None = None,
+           antialias: bool = True) -> pg.Surface:
+    """
+    Отрендеренная строка из LRU-кэша по (шрифт, размер, текст, цвет, antialias).
+    Статичные подписи рендерятся один раз, меняющиеся числа — только при смене значения.
+    """
+    key = (font_name, size, str(text), tuple(color), antialias)
+    surf = _RENDERED.get(key)
+    if surf is None:
+        surf = _RENDERED.put(key, get_font(size, font_name).render(str(text), antialias, color))
+    return surf
+
+
+def text_cache_stats() -> dict:
+    return _RENDERED.stats()
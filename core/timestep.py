@@ -0,0 +1,28 @@
+class FixedTimestep:
+    """
+    Фиксированный шаг симуляции с аккумулятором.
+    advance(frame_dt) говорит, сколько шагов по step секунд прогнать в этом кадре;
+    alpha — доля недобранного шага (0..1) для интерполяции при отрисовке.
+    Если кадр был слишком долгим, шагов не больше max_steps, а остаток
+    выбрасывается — иначе медленная машина уходит в «спираль смерти».
+    """
+
+    def __init__(self, tick_rate: float = 120.0, max_steps: int = 5):
+        self.step = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.acc = 0.0
+        self.dropped = 0.0   # сколько симуляционного времени выброшено догонялкой
+
+    def advance(self, frame_dt: float) -> int:
+        self.acc += frame_dt
+        steps = int(self.acc / self.step)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.step
+            self.acc -= (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        self.acc -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        return min(1.0, self.acc / self.step)
@@ -1,9 +1,17 @@
 import pygame as pg
 import math
-from .resources import font, img, sfx
+from .resources import font, img_scaled, img_size, sfx, asset_index
+from .text import render
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
+INTRO_FONT = "better-vcr-5.2.ttf"
+# сколько промежуточных масштабов строки заготавливать для анимации появления
+INTRO_SCALE_STEPS = 6
+# тосты: сколько одновременно на экране и минимальный промежуток между звуками
+TOAST_MAX = 4
+TOAST_SOUND_GAP_MS = 250
+
 @dataclass
 class _IntroLine:
     text: str
@@ -35,12 +43,8 @@ class MiniIntro:
         self.fade_in = fade_in
         self.line_gap = line_gap
         self.start_delay_step = start_delay_step
-        self.bg_image = None
-        if bg_image:
-            try:
-                self.bg_image = pg.image.load(f"assets/img/{bg_image}").convert()
-            except Exception:
-                self.bg_image = None
+        # есть ли файл — по индексу ассетов, не декодируя исходник целиком
+        self.bg_image = bg_image if bg_image and asset_index('img').find(bg_image) else None
 
         self.time = 0.0
         self.hide = False
@@ -48,8 +52,6 @@ class MiniIntro:
         self.hide_time = 0.0
         self.hide_dur = 0.30
 
-        # подготовка строк
-        self.font_cache: dict[int, pg.font.Font] = {}
         t0 = 0.0
         self.lines: List[_IntroLine] = []
         for text, size, color in self.lines_raw:
@@ -58,10 +60,55 @@ class MiniIntro:
 
         self.hint_alpha = 0.0
 
+        # всё, что не меняется от кадра к кадру, готовим заранее (см. _prepare)
+        self._size = None
+        screen = pg.display.get_surface()
+        if screen is not None:
+            self._prepare(screen.get_size())
+
     def _font(self, size: int):
-        if size not in self.font_cache:
-            self.font_cache[size] = pg.font.Font("assets/fonts/better-vcr-5.2.ttf", size)
-        return self.font_cache[size]
+        return font(INTRO_FONT, size)
+
+    def _prepare(self, size):
+        """Фон с затемнением, строки со ступенями масштаба, раскладка, подсказка, шторка."""
+        W, H = size
+        self._size = size
+
+        # фон уже с затемнением: в кадре — один blit (или fill)
+        self._bg = None
+        self._bg_fill = None
+        self._overlay = None
+        if self.bg_image:
+            self._bg = img_scaled(self.bg_image, (W, H)).copy()
+            self._bg.blit(_dim_surface((W, H), 40), (0, 0))
+        elif self.bg_color:
+            k = (255 - 40) / 255.0
+            self._bg_fill = tuple(int(c * k) for c in self.bg_color)
+        else:
+            self._overlay = _dim_surface((W, H), 40)
+
+        # строки: отрендерены один раз + несколько шагов масштаба для «наезда»
+        total_h = sum(self._font(L.size).get_height() for L in self.lines)
+        total_h += self.line_gap * (len(self.lines) - 1)
+        y = H // 2 - total_h // 2
+        self._steps = []
+        self._tops = []
+        for L in self.lines:
+            base = self._font(L.size).render(L.text, True, L.color).convert_alpha()
+            steps = []
+            for i in range(INTRO_SCALE_STEPS + 1):
+                sc = 1.06 - 0.06 * i / INTRO_SCALE_STEPS
+                sw = max(1, int(base.get_width() * sc))
+                sh = max(1, int(base.get_height() * sc))
+                steps.append(pg.transform.smoothscale(base, (sw, sh)) if i < INTRO_SCALE_STEPS else base)
+            self._steps.append(steps)
+            self._tops.append(y)
+            y += base.get_height() + self.line_gap
+
+        self._hint = self._font(20).render(self.hint_text, True, (230, 230, 230)).convert_alpha()
+        self._hint_rect = self._hint.get_rect(center=(W // 2, H - 60))
+        self._fade = pg.Surface((W, H)).convert()
+        self._fade.fill((0, 0, 0))
 
     def handle_event(self, e: pg.event.Event):
         if self.done:
@@ -91,58 +138,39 @@ class MiniIntro:
     def draw(self, screen: pg.Surface):
         if self.done:
             return
-        # В draw() — перед затемнением и текстом:
         W, H = screen.get_size()
-
-        # 1) Фон-картинка (если есть) — подгоняем по размеру экрана:
-        if self.bg_image:
-            bg = pg.transform.smoothscale(self.bg_image, (W, H))
-            screen.blit(bg, (0, 0))
-        elif self.bg_color:
-            # fallback: однотонный фон
-            screen.fill(self.bg_color)
-
-        overlay = pg.Surface((W, H), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 40))
-        screen.blit(overlay, (0, 0))
-
-        total_h = 0
-        for L in self.lines:
-            f = self._font(L.size)
-            rect = f.render(L.text, True, L.color).get_rect()
-            total_h += rect.height
-        total_h += self.line_gap * (len(self.lines) - 1)
-
-        y = H // 2 - total_h // 2
-        for L in self.lines:
-            f = self._font(L.size)
-            surf = f.render(L.text, True, L.color)
-            if abs(L.scale - 1.0) > 0.001:
-                sw = max(1, int(surf.get_width() * L.scale))
-                sh = max(1, int(surf.get_height() * L.scale))
-                surf = pg.transform.smoothscale(surf, (sw, sh))
+        if self._size != (W, H):
+            self._prepare((W, H))
+
+        if self._bg is not None:
+            screen.blit(self._bg, (0, 0))
+        elif self._bg_fill is not None:
+            screen.fill(self._bg_fill)
+        else:
+            screen.blit(self._overlay, (0, 0))
+
+        for L, steps, top in zip(self.lines, self._steps, self._tops):
+            # ближайшая заготовленная ступень масштаба 1.06 → 1.0
+            i = round((1.06 - L.scale) / 0.06 * INTRO_SCALE_STEPS)
+            surf = steps[max(0, min(INTRO_SCALE_STEPS, i))]
+            surf.set_alpha(int(L.alpha))
             rect = surf.get_rect(centerx=W // 2)
-            rect.top = int(y + L.yofs)
-            if L.alpha < 255:
-                s2 = surf.convert_alpha()
-                s2.fill((255, 255, 255, int(L.alpha)), special_flags=pg.BLEND_RGBA_MULT)
-                screen.blit(s2, rect.topleft)
-            else:
-                screen.blit(surf, rect.topleft)
-            y = rect.bottom + self.line_gap
-
-        hint_font = self._font(20)
-        hint = hint_font.render(self.hint_text, True, (230, 230, 230))
-        hint_rect = hint.get_rect(center=(W // 2, H - 60))
-        hint_s = hint.convert_alpha()
-        hint_s.fill((255, 255, 255, int(self.hint_alpha)), special_flags=pg.BLEND_RGBA_MULT)
-        screen.blit(hint_s, hint_rect)
+            rect.top = int(top + L.yofs)
+            screen.blit(surf, rect.topleft)
+
+        self._hint.set_alpha(int(self.hint_alpha))
+        screen.blit(self._hint, self._hint_rect)
 
         if self.hide:
             k = min(1.0, self.hide_time / self.hide_dur)
-            fade = pg.Surface((W, H), pg.SRCALPHA)
-            fade.fill((0, 0, 0, int(255 * k)))
-            screen.blit(fade, (0, 0))
+            self._fade.set_alpha(int(255 * k))
+            screen.blit(self._fade, (0, 0))
+
+
+def _dim_surface(size, alpha):
+    dim = pg.Surface(size, pg.SRCALPHA)
+    dim.fill((0, 0, 0, alpha))
+    return dim
 
 
 class Button:
@@ -150,14 +178,18 @@ class Button:
         self.rect = pg.Rect(rect)
         self.text = text
         self.on_click = on_click
+        self.hover = False   # курсор над кнопкой — рамка подсвечивается
 
     def draw(self, surface):
         pg.draw.rect(surface, (30,30,30), self.rect, border_radius=8)
-        pg.draw.rect(surface, (200,200,200), self.rect, 2, border_radius=8)
-        label = font("better-vcr-5.2.ttf", 24).render(self.text, True, (240,240,240))
+        border = (255,230,140) if self.hover else (200,200,200)
+        pg.draw.rect(surface, border, self.rect, 2, border_radius=8)
+        label = render(self.text, 24, (240,240,240), font_name="better-vcr-5.2.ttf")
         surface.blit(label, label.get_rect(center=self.rect.center))
 
     def handle_event(self, event):
+        if event.type == pg.MOUSEMOTION:
+            self.hover = self.rect.collidepoint(event.pos)
         if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
             if self.rect.collidepoint(event.pos):
                 self.on_click()
@@ -166,53 +198,88 @@ def _ease_out_cubic(t: float) -> float:
     return 1 - (1 - t) ** 3
 
 class ToastManager:
+    """
+    Всплывающие уведомления справа сверху. Каждый тост рендерится один раз
+    в push() в готовую карточку; в кадре она только сдвигается и гаснет.
+    Одинаковые тосты склеиваются («×2»), одновременно видно не больше TOAST_MAX.
+    """
+
     def __init__(self):
         self.items = []
         self.in_dur  = 0.30    # «выплыть» сверху
         self.out_dur = 0.30    # «уплыть» вверх
         self.pad = 10
         self.gap = 8
+        self._last_sound = -10**9
         # дефолтные ресурсы
         self._default_icon = None
         self._pop_sfx = None
-        try:
-            self._default_icon = img("trophy.png")        # assets/img/trophy.png
-        except Exception:
-            self._default_icon = None
+        if asset_index('img').find("trophy.png"):        # assets/img/trophy.png
+            self._default_icon = "trophy.png"
         try:
             self._pop_sfx = sfx("achieve.wav")            # assets/sfx/achieve.wav
             self._pop_sfx.set_volume(0.75)
         except Exception:
             self._pop_sfx = None
 
-    def push(self, text: str, ttl: float = 2.5, *, icon_name: str | None = None, play_sound: bool = True):
+    def _card(self, text: str, icon: str | None) -> pg.Surface:
+        """Фон, рамка, иконка и текст — одной поверхностью."""
         surf = font("better-vcr-5.2.ttf", 22).render(text, True, (255,255,255))
-        icon = None
-        if icon_name:
-            try:
-                icon = img(icon_name)
-            except Exception:
-                icon = None
-        if icon is None:
-            icon = self._default_icon
-
-        icon_w = icon.get_width() if icon else 0
+        tw, th = surf.get_size()
+        # геометрия как у прежнего тоста: место под иконку — по размеру исходника,
+        # а рисуется она уменьшенной до высоты карточки, но не выше 24 px
+        iw, ih = img_size(icon) if icon else (0, 0)
         icon_gap = 8 if icon else 0
+        w = self.pad*2 + iw + icon_gap + tw
+        h = self.pad*2 + max(th, ih)
+        card = pg.Surface((w, h), pg.SRCALPHA)
+        card.fill((20, 20, 28, 220))
+        pg.draw.rect(card, (180, 180, 200, 255), card.get_rect(), 2, border_radius=8)
+        x = self.pad
+        if icon:
+            icon_surf = img_scaled(icon, (None, min(h - self.pad*2, 24)))
+            card.blit(icon_surf, (x, self.pad))
+            x += icon_surf.get_width() + icon_gap
+        card.blit(surf, (x, self.pad))
+        return card
 
-        tw, th = surf.get_size()
-        w_total = self.pad*2 + icon_w + icon_gap + tw
-        h_total = self.pad*2 + max(th, icon.get_height() if icon else th)
+    def push(self, text: str, ttl: float = 2.5, *, icon_name: str | None = None, play_sound: bool = True):
+        icon = icon_name if icon_name and asset_index('img').find(icon_name) else None
+        if icon is None:
+            icon = self._default_icon
 
+        # такой же тост ещё на экране — продлеваем его и увеличиваем счётчик
+        for it in self.items:
+            if it["text"] == text and it["icon"] == icon and it["time"] > self.out_dur:
+                it["count"] += 1
+                it["surf"] = self._card(f"{text} ×{it['count']}", icon)
+                it["size"] = it["surf"].get_size()
+                shown = it["ttl"] - it["time"]  # сколько уже висит: заново не выплывает
+                it["time"] = max(it["time"], ttl)
+                it["ttl"] = it["time"] + shown
+                return
+
+        card = self._card(text, icon)
         item = {
-            "text": text, "time": ttl, "ttl": ttl, "surf": surf,
-            "size": (w_total, h_total), "icon": icon, "played": False,
+            "text": text, "time": ttl, "ttl": ttl, "surf": card,
+            "size": card.get_size(), "icon": icon, "played": False, "count": 1,
         }
         self.items.append(item)
 
-        if play_sound and self._pop_sfx:
+        # лишние старые — досрочно уплывают, совсем старые выкидываем
+        live = [it for it in self.items if it["time"] > self.out_dur]
+        for it in live[:max(0, len(live) - TOAST_MAX)]:
+            it["time"] = self.out_dur
+        if len(self.items) > TOAST_MAX * 2:
+            del self.items[:len(self.items) - TOAST_MAX * 2]
+
+        # пачка ачивок за один кадр — один звук
+        now = pg.time.get_ticks()
+        if play_sound and self._pop_sfx and now - self._last_sound >= TOAST_SOUND_GAP_MS:
             try:
                 self._pop_sfx.play()
                 item["played"] = True
+                self._last_sound = now
             except Exception:
                 pass
 
@@ -227,22 +294,13 @@ class ToastManager:
 
         sw, _ = surface.get_size()
         x_right = sw - 16
-        y_top = 16
+        y = 16
 
-        # целевые позиции стека
-        targets = []
-        y = y_top
         for it in self.items:
-            w, h = it["size"]
-            r = pg.Rect(0, 0, w, h)
-            r.top = y
-            r.right = x_right
-            targets.append(r)
-            y += h + self.gap
-
-        for it, rect in zip(self.items, targets):
             ttl, t = it["ttl"], it["time"]
             w, h = it["size"]
+            top = y
+            y += h + self.gap
 
             # вход
             t_in = ttl - t
@@ -256,33 +314,13 @@ class ToastManager:
                 slide_out_k = _ease_out_cubic(u)
                 fade_k = 1.0 - u
             elif t < 0:
-                slide_out_k = 1.0
-                fade_k = 0.0
+                continue
 
             dy_in  = (1.0 - slide_in_k) * (h + self.gap)
             dy_out = slide_out_k * (h + self.gap)
-            y_actual = rect.top - dy_in - dy_out
-
-            # фон
-            bg = pg.Surface((w, h), pg.SRCALPHA)
-            bg.fill((20, 20, 28, int(220 * fade_k)))
-            surface.blit(bg, (rect.left, y_actual))
-            # рамка
-            pg.draw.rect(surface, (180,180,200, int(255*fade_k)),
-                         pg.Rect(rect.left, y_actual, w, h), 2, border_radius=8)
-
-            # иконка + текст
-            cx = rect.left + self.pad
-            cy = y_actual + self.pad
-            if it["icon"] is not None and fade_k > 0:
-                icon = it["icon"]
-                ih = min(h - self.pad*2, 24)
-                iw = max(1, int(icon.get_width() * (ih / icon.get_height())))
-                icon_draw = pg.transform.smoothscale(icon, (iw, ih))
-                surface.blit(icon_draw, (cx, cy))
-                cx += iw + 8
-            if fade_k > 0:
-                surface.blit(it["surf"], (cx, cy))
+            card = it["surf"]
+            card.set_alpha(int(255 * fade_k))
+            surface.blit(card, (x_right - w, top - dy_in - dy_out))
 
 
 TOASTS = ToastManager()
\ No newline at end of file
@@ -1,9 +1,20 @@
 import pygame as pg
+from core.resources import asset_index
+from core.profiler import FrameProfiler
+from core.timestep import FixedTimestep
 from core.scene_manager import SceneManager
 from scenes.menu import MenuScene
 
 WIDTH, HEIGHT = 960, 540
-FPS = 60
+FPS = 60            # ограничение частоты отрисовки
+# симуляция фиксированным шагом: TICK_RATE обновлений в секунду независимо от FPS
+FIXED_STEP = True
+TICK_RATE = 120
+MAX_CATCHUP_STEPS = 5
+# выводить на дисплей только изменившиеся области вместо flip() каждый кадр
+DIRTY_RECTS = False
+# куда писать CSV с таймингами кадров при выходе (None — не писать)
+PROFILE_DIR = "profiles"
 
 def main():
     pg.init()
@@ -13,19 +24,50 @@ def main():
         print("Audio init failed — continuing without sound")
     screen = pg.display.set_mode((WIDTH, HEIGHT))
     clock = pg.time.Clock()
-    manager = SceneManager(screen, start_scene=MenuScene)
+    # индекс ассетов строим один раз, заодно сразу видим неоднозначные имена
+    asset_index("img"); asset_index("data")
+    manager = SceneManager(screen, start_scene=MenuScene, dirty_rects=DIRTY_RECTS)
+    profiler = FrameProfiler(out_dir=PROFILE_DIR)
+    stepper = FixedTimestep(TICK_RATE, MAX_CATCHUP_STEPS) if FIXED_STEP else None
 
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0
+        profiler.begin_frame(type(manager.scene).__name__)
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 running = False
+            if event.type == pg.KEYDOWN and event.key == pg.K_F3:
+                profiler.toggle_overlay()  # оверлей с таймингами кадра
+                manager.scene.invalidate()
+                continue
             manager.handle_event(event)
-        manager.update(dt)
-        manager.draw()
-        pg.display.flip()
+        profiler.lap("event")
+        if stepper:
+            for _ in range(stepper.advance(dt)):
+                manager.update(stepper.step)
+            interp = stepper.alpha
+        else:
+            manager.update(dt)
+            interp = 1.0
+        profiler.lap("update")
+        if profiler.overlay:
+            manager.scene.invalidate()  # оверлей рисуется поверх — сцену под ним обновляем
+        rects = manager.draw(interp)
+        if profiler.overlay:
+            profiler.draw_overlay(screen, 1000.0 / FPS)
+            rects = None
+        profiler.lap("draw")
+        if rects is None:
+            pg.display.flip()
+        elif rects:
+            pg.display.update(rects)
+        profiler.lap("flip")
+        profiler.end_frame()
 
+    path = profiler.dump_csv()
+    if path:
+        print("Frame timings saved:", path)
     pg.quit()
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import pygame as pg
 from core.base_scene import BaseScene
 from core.ui import Button
+from core.text import render
 
 ACHI_LIST = [
     ("da_ya_zhestkii", "Да я жёсткий"),
@@ -11,6 +12,9 @@ ACHI_LIST = [
     ("coat", "Зато шубка есть")
 ]
 
+BG = (16, 16, 20)
+
+
 class AchievementsView(BaseScene):
     def __init__(self, manager, state):
         super().__init__(manager)
@@ -25,13 +29,21 @@ class AchievementsView(BaseScene):
         self.back.handle_event(e)
 
     def draw(self):
-        self.screen.fill((16,16,20))
+        if not self.full_redraw:
+            # список не меняется; перерисовываем только подсветку кнопки «Назад»
+            if self.back.hover == self._back_hover:
+                return []
+            self._back_hover = self.back.hover
+            self.screen.fill(BG, self.back.rect)
+            self.back.draw(self.screen)
+            return [self.back.rect]
+        self._back_hover = self.back.hover
+        self.screen.fill(BG)
         self.back.draw(self.screen)
         y = 100
         for key, title in ACHI_LIST:
             opened = key in self.state.achievements
             color = (230,255,130) if opened else (120,120,120)
             pg.draw.circle(self.screen, color, (80, y+10), 8)
-            font = pg.font.SysFont(None, 28)
-            self.screen.blit(font.render(title, True, color), (100, y))
+            self.screen.blit(render(title, 28, color), (100, y))
             y += 40
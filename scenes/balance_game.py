@@ -1,6 +1,7 @@
 # scenes/balance_game.py
 import pygame as pg
 from core.base_scene import BaseScene
+from core.text import render
 
 GRAVITY = 1200
 
@@ -33,7 +34,7 @@ class BalanceGame(BaseScene):
         self.drop_y = 80
 
         # контейнер для падающих "обрезков" (визуальный эффект)
-        self.fragments: list[tuple[pg.Rect, float]] = []
+        self.fragments: list[list] = []   # [rect, vy, y]: y дробный, rect.y = int(y)
 
         # цель по количеству уложенных слоёв
         self.goal = 8
@@ -63,6 +64,7 @@ class BalanceGame(BaseScene):
         self.dir = 1
         self.x = 40
         self.active = pg.Rect(self.x, self.drop_y, self.block_w, self.slot_rect.height)
+        self.active_y = float(self.active.y)
 
     # ---------- события ----------
     def handle_event(self, e):
@@ -92,7 +94,8 @@ class BalanceGame(BaseScene):
         else:
             # падение
             self.vy += GRAVITY * dt
-            self.active.y += int(self.vy * dt)
+            self.active_y += self.vy * dt
+            self.active.y = int(self.active_y)
 
             # посадка при достижении низа слота
             if self.active.bottom >= self.slot_rect.bottom:
@@ -101,7 +104,7 @@ class BalanceGame(BaseScene):
                 # слишком узкий остаток — промах → кат-сцена-ретрай
                 min_width = max(8, self.slot_rect.height // 2)
                 if placed.width < min_width or placed.height <= 0:
-                    self.fragments.append([self.active.copy(), self.vy])
+                    self.fragments.append([self.active.copy(), self.vy, self.active_y])
                     from scenes.cutscene import CutsceneScene
                     self.mgr.switch(CutsceneScene, state=self.state,
                                     script_file="script_ch1_balance_retry.json",
@@ -113,12 +116,12 @@ class BalanceGame(BaseScene):
                     left_part = pg.Rect(self.active.left, self.slot_rect.top,
                                         self.slot_rect.left - self.active.left, self.slot_rect.height)
                     if left_part.width > 0:
-                        self.fragments.append([left_part, self.vy])
+                        self.fragments.append([left_part, self.vy, float(left_part.y)])
                 if self.active.right > self.slot_rect.right:
                     right_part = pg.Rect(self.slot_rect.right, self.slot_rect.top,
                                          self.active.right - self.slot_rect.right, self.slot_rect.height)
                     if right_part.width > 0:
-                        self.fragments.append([right_part, self.vy])
+                        self.fragments.append([right_part, self.vy, float(right_part.y)])
 
                 # кладём только пересечение
                 self.blocks.append(placed)
@@ -145,10 +148,11 @@ class BalanceGame(BaseScene):
 
         # падение обрезков
         for frag in self.fragments:
-            rect, vy = frag
+            rect, vy, y = frag
             vy += GRAVITY * dt
-            rect.y += int(vy * dt)
-            frag[1] = vy
+            y += vy * dt
+            rect.y = int(y)
+            frag[1], frag[2] = vy, y
         # чистим, что улетело
         self.fragments = [f for f in self.fragments if f[0].top < H + 200]
 
@@ -170,11 +174,10 @@ class BalanceGame(BaseScene):
             pg.draw.rect(self.screen, (220, 190, 110), self.active, border_radius=4)
 
         # падающие обрезки
-        for rect, _vy in self.fragments:
+        for rect, _vy, _y in self.fragments:
             pg.draw.rect(self.screen, (150, 120, 70), rect, border_radius=4)
 
         # подсказка
-        tip = pg.font.SysFont(None, 22).render(
-            "SPACE — сбросить. Блоки разной толщины и с зазорами. Собери 8 слоёв.",
-            True, (210, 210, 210))
+        tip = render("SPACE — сбросить. Блоки разной толщины и с зазорами. Собери 8 слоёв.",
+                     22, (210, 210, 210))
         self.screen.blit(tip, (16, 12))
@@ -1,6 +1,7 @@
 # scenes/birthday_game.py
 import pygame as pg
 from core.base_scene import BaseScene
+from core.text import render
 
 
 class BirthdayGame(BaseScene):
@@ -15,10 +16,15 @@ class BirthdayGame(BaseScene):
         # платформа
         self.paddle = pg.Rect(w//2 - 50, h - 40, 100, 16)
         self.paddle_speed = 360
+        # позиции храним во float: int(v*dt) на мелком шаге теряет скорость
+        self.paddle_x = float(self.paddle.x)
+        self.prev_paddle_x = self.paddle_x
 
         # мяч
         self.ball = pg.Rect(w//2 - 8, h//2, 16, 16)
         self.ball_vel = pg.Vector2(200, -240)
+        self.ball_pos = pg.Vector2(self.ball.topleft)
+        self.prev_ball_pos = pg.Vector2(self.ball_pos)
 
         # блоки
         self.blocks = []
@@ -41,12 +47,15 @@ class BirthdayGame(BaseScene):
     def update(self, dt):
         keys = pg.key.get_pressed()
         vx = (keys[pg.K_d] or keys[pg.K_RIGHT]) - (keys[pg.K_a] or keys[pg.K_LEFT])
-        self.paddle.x += int(vx * self.paddle_speed * dt)
-        self.paddle.clamp_ip(self.screen.get_rect())
+        self.prev_paddle_x = self.paddle_x
+        self.paddle_x += vx * self.paddle_speed * dt
+        self.paddle_x = max(0.0, min(self.screen.get_width() - self.paddle.width, self.paddle_x))
+        self.paddle.x = round(self.paddle_x)
 
         # движение мяча
-        self.ball.x += int(self.ball_vel.x * dt)
-        self.ball.y += int(self.ball_vel.y * dt)
+        self.prev_ball_pos.update(self.ball_pos)
+        self.ball_pos += self.ball_vel * dt
+        self.ball.topleft = (round(self.ball_pos.x), round(self.ball_pos.y))
 
         # отражения от стен
         if self.ball.left <= 0 or self.ball.right >= self.screen.get_width():
@@ -63,6 +72,8 @@ class BirthdayGame(BaseScene):
             # рестарт мяча
             self.ball.center = (self.screen.get_width()//2, self.screen.get_height()//2)
             self.ball_vel = pg.Vector2(200, -240)
+            self.ball_pos.update(self.ball.topleft)
+            self.prev_ball_pos.update(self.ball_pos)
 
         # отражение от платформы
         if self.ball.colliderect(self.paddle) and self.ball_vel.y > 0:
@@ -110,12 +121,15 @@ class BirthdayGame(BaseScene):
         for b in self.blocks:
             pg.draw.rect(self.screen, (200, 160, 100), b)
 
-        # платформа
-        pg.draw.rect(self.screen, (120,220,120), self.paddle)
+        # платформа и мяч — между прошлым и текущим шагом симуляции
+        k = self.interp
+        paddle = self.paddle.copy()
+        paddle.x = round(self.prev_paddle_x + (self.paddle_x - self.prev_paddle_x) * k)
+        pg.draw.rect(self.screen, (120,220,120), paddle)
 
-        # мяч
-        pg.draw.ellipse(self.screen, (255,240,150), self.ball)
+        ball = self.ball.copy()
+        ball.topleft = self.prev_ball_pos.lerp(self.ball_pos, k)
+        pg.draw.ellipse(self.screen, (255,240,150), ball)
 
         # HUD
-        f = pg.font.SysFont(None, 22)
-        self.screen.blit(f.render(f"Жизни: {self.lives}", True, (230,230,230)), (16, 10))
+        self.screen.blit(render(f"Жизни: {self.lives}", 22, (230,230,230)), (16, 10))
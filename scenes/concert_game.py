@@ -1,30 +1,35 @@
 import random
 import pygame as pg
 from core.anim import AnimatedSprite
-from core.resources import img
+from core.resources import img_scaled
+from core.text import render
 from core.base_scene import BaseScene
 from core.ui import MiniIntro
+from core.crowd import Crowd, UniformGrid
 
 RND = random.Random()
 
 class ConcertGame(BaseScene):
-    def __init__(self, manager, state):
+    BG = "ch1_dancefloor.png"  # assets/img/ch1/ch1_dancefloor.png
+
+    @classmethod
+    def preload_assets(cls, screen_size, **kwargs):
+        # фон — в размере экрана, как его рисуют draw() и заставка
+        return [(cls.BG, screen_size)] + AnimatedSprite.asset_names("character")
+
+    def __init__(self, manager, state, n_bullies=8):
         super().__init__(manager)
         self.state = state
 
-        # фон (танцпол)
-        self.bg = img("ch1_dancefloor.png")  # assets/img/ch1_dancefloor.png
-
-        w, h = self.screen.get_size()
+        # фон (танцпол), сразу в размер экрана
+        self.bg = img_scaled(self.BG, self.screen.get_size())
 
         # игрок
-        self.hp = 100
         self.player_speed = 200
         self.player = AnimatedSprite(base_dir="character", fps=10, scale=1.0)
-        self.player.pos.update(100, 140)  # стартовая позиция
 
         # враги «верзилы»
-        self.n_bullies = 8
+        self.n_bullies = n_bullies
         self.bully_min_speed = 50
         self.bully_max_speed = 210
         self.bully_change_dir_min = 0.8
@@ -38,19 +43,33 @@ class ConcertGame(BaseScene):
         self.drink_radius = 8
         self.heal_on_pickup = 25
 
+        # враги и напитки рисуются готовыми кружками через blits
+        self.bully_sprite = self._disc(self.bully_radius, (180, 60, 60))
+        self.drink_sprite = self._disc(self.drink_radius, (200, 200, 80))
+
         # выход
         self.exit_rect = pg.Rect(820, 440, 100, 80)
 
+        self.reset()
+
+    def reset(self):
+        """Новая попытка: ресурсы (фон, спрайт) остаются, состояние игры — заново."""
+        w, h = self.screen.get_size()
+
+        self.hp = 100
+        self.player.pos.update(100, 140)  # стартовая позиция
+        self.player.set_direction("forward")
+        self.player.update(0, False)
+
         # спавним врагов и напитки
-        self.bullies = []
-        for _ in range(self.n_bullies):
-            pos = pg.Vector2(RND.randint(100, w - 100), RND.randint(100, h - 60))
-            vel = self._random_dir() * RND.uniform(self.bully_min_speed, self.bully_max_speed)
-            timer = RND.uniform(self.bully_change_dir_min, self.bully_change_dir_max)
-            self.bullies.append({"pos": pos, "vel": vel, "timer": timer})
+        self.bullies = Crowd(self.n_bullies, RND, (100, 100, w - 100, h - 60),
+                             speed=(self.bully_min_speed, self.bully_max_speed),
+                             change_dir=(self.bully_change_dir_min, self.bully_change_dir_max),
+                             aggro_radius=self.bully_aggro_radius)
 
         self.drinks = [pg.Vector2(RND.randint(80, w - 80), RND.randint(80, h - 40))
                        for _ in range(self.max_drinks)]
+        self.drink_grid = UniformGrid(64).build([d.x for d in self.drinks], [d.y for d in self.drinks])
 
         # кулдаун для запрета «саморегенерации»
         self.regen_cooldown = 0.0
@@ -65,15 +84,15 @@ class ConcertGame(BaseScene):
             auto_start_after=None,  # можно поставить, например, 2.0
             fade_in=0.6,  # было 0.35
             start_delay_step=0.30,  # было 0.18
-            bg_image="ch1/ch1_dancefloor.png"
+            bg_image=self.BG
         )
 
     # ---------------- utils ----------------
-    def _random_dir(self) -> pg.Vector2:
-        v = pg.Vector2(RND.uniform(-1, 1), RND.uniform(-1, 1))
-        if v.length_squared() == 0:
-            v = pg.Vector2(1, 0)
-        return v.normalize()
+    @staticmethod
+    def _disc(radius, color) -> pg.Surface:
+        surf = pg.Surface((radius * 2, radius * 2), pg.SRCALPHA)
+        pg.draw.circle(surf, color, (radius, radius), radius)
+        return surf.convert_alpha()
 
     def _clamp_in_screen(self, pos: pg.Vector2):
         w, h = self.screen.get_size()
@@ -117,43 +136,23 @@ class ConcertGame(BaseScene):
         # анимация шага
         self.player.update(dt, moving)
 
-        # поведение «верзил»
+        # поведение «верзил»: блуждают, подруливают к игроку, отскакивают от краёв
         w, h = self.screen.get_size()
-        for b in self.bullies:
-            b["timer"] -= dt
-            if b["timer"] <= 0:
-                new_dir = self._random_dir()
-                new_spd = RND.uniform(self.bully_min_speed, self.bully_max_speed)
-                b["vel"] = new_dir * new_spd
-                b["timer"] = RND.uniform(self.bully_change_dir_min, self.bully_change_dir_max)
-
-            to_player = self.player.pos - b["pos"]
-            dist2 = to_player.length_squared()
-            if 0 < dist2 < self.bully_aggro_radius ** 2:
-                # немного «подруливать» к игроку
-                steer = to_player.normalize() * 1500
-                b["vel"] = (b["vel"] + steer * dt).normalize() * max(60, b["vel"].length())
-
-            b["pos"] += b["vel"] * dt
-            bounced = False
-            if b["pos"].x < 20 or b["pos"].x > w - 20:
-                b["vel"].x *= -1; bounced = True
-            if b["pos"].y < 20 or b["pos"].y > h - 20:
-                b["vel"].y *= -1; bounced = True
-            if bounced:
-                self._clamp_in_screen(b["pos"])
+        px, py = self.player.pos
+        self.bullies.step(dt, px, py, w, h)
 
         # урон от «верзил»
-        was_hit = any((b["pos"] - self.player.pos).length() < (self.bully_radius + 12) for b in self.bullies)
-        if was_hit:
+        if self.bullies.any_near(px, py, self.bully_radius + 12):
             self.hp -= self.damage_per_sec * dt
             self.regen_cooldown = 0.0  # на будущее, если введёшь реген
 
         # подбор «напитков»
-        picked = [d for d in self.drinks if (d - self.player.pos).length() < (self.drink_radius + 12)]
+        picked = self.drink_grid.query(px, py, self.drink_radius + 12)
         if picked:
             self.hp = min(100, self.hp + self.heal_on_pickup * len(picked))
-            self.drinks = [d for d in self.drinks if (d - self.player.pos).length() >= (self.drink_radius + 12)]
+            picked = set(picked)
+            self.drinks = [d for i, d in enumerate(self.drinks) if i not in picked]
+            self.drink_grid.build([d.x for d in self.drinks], [d.y for d in self.drinks])
 
         # смерть → retry-катсцена
         self.hp = max(0, min(100, self.hp))
@@ -186,12 +185,13 @@ class ConcertGame(BaseScene):
         pg.draw.rect(self.screen, (60, 180, 120), self.exit_rect)
 
         # враги
-        for b in self.bullies:
-            pg.draw.circle(self.screen, (180, 60, 60), (int(b["pos"].x), int(b["pos"].y)), self.bully_radius)
+        r = self.bully_radius
+        self.screen.blits([(self.bully_sprite, p) for p in self.bullies.positions(-r, -r)], doreturn=False)
 
         # напитки
-        for d in self.drinks:
-            pg.draw.circle(self.screen, (200, 200, 80), (int(d.x), int(d.y)), self.drink_radius)
+        r = self.drink_radius
+        self.screen.blits([(self.drink_sprite, (int(d.x) - r, int(d.y) - r)) for d in self.drinks],
+                          doreturn=False)
 
         # игрок-спрайт
         self.player.draw(self.screen)
@@ -202,6 +202,5 @@ class ConcertGame(BaseScene):
         pg.draw.rect(self.screen, (120, 220, 120), (30, 20, w, 16))
 
         # подсказка
-        tip = pg.font.SysFont(None, 22).render(
-            "WASD — двигайся, избегай верзил, подбирай напитки", True, (220, 220, 230))
+        tip = render("WASD — двигайся, избегай верзил, подбирай напитки", 22, (220, 220, 230))
         self.screen.blit(tip, (30, 500))
@@ -1,7 +1,11 @@
 # scenes/cutscene.py
 import pygame as pg
 from core.base_scene import BaseScene
-from core.resources import img, font, load_json
+from core.text import layout
+from core.resources import img_scaled, img_async, placeholder, font, load_json, pin_img, unpin_img
+
+# сколько следующих слайдов грузим в фоне, пока игрок читает текущий
+PREFETCH_SLIDES = 3
 
 
 def _resolve_scene(key):
@@ -35,6 +39,20 @@ class CutsceneScene(BaseScene):
     В JSON можно указать "next": "<scene_key>", это перекроет параметр next_scene.
     """
 
+    @classmethod
+    def preload_assets(cls, screen_size, script_file=None, **kwargs):
+        # первые слайды — в тех же размерах, в которых они будут нарисованы
+        data = load_json(script_file)
+        slides = data["slides"] if "slides" in data else data
+        w, h = screen_size
+        out = []
+        for slide in slides[:1 + PREFETCH_SLIDES]:
+            if slide.get("bg"):
+                out.append((slide["bg"], (w, h), False))
+            if slide.get("portrait"):
+                out.append((slide["portrait"], (None, int(int(h * 0.17) * 4.5)), True))
+        return out
+
     def __init__(self, manager, state, script_file, next_scene):
         super().__init__(manager)
         self.state = state
@@ -48,11 +66,72 @@ class CutsceneScene(BaseScene):
         self.alpha = 0  # для fade-in
         self._next_allowed = 0  # debounce клика
         self._w, self._h = self.screen.get_size()
+        # размеры, в которых рисуются фон и портрет (под них и грузим)
+        self._bg_size = (self._w, self._h)
+        self._portrait_size = (None, int(int(self._h * 0.17) * 4.5))
 
         # шрифты
         self.font_text = font("better-vcr-5.2.ttf", 24)
         self.font_name = font("better-vcr-5.2.ttf", 20)
 
+        self._pinned = []
+        self._handles = {}
+        self._painted = None  # состояние последнего нарисованного кадра
+        self._painted_rects = []  # и области его панели/портрета
+        self._pin_slide()
+        self._prefetch()
+        self._preload_next()
+
+    def _pin_slide(self):
+        """Закрепляем в кэше картинки текущего слайда, прошлые открепляем."""
+        for name in self._pinned:
+            unpin_img(name)
+        self._pinned = []
+        if self.idx < len(self.slides):
+            slide = self.slides[self.idx]
+            for name in (slide.get("bg"), slide.get("portrait")):
+                if name:
+                    pin_img(name)
+                    self._pinned.append(name)
+
+    def _prefetch(self):
+        """Запускаем фоновую загрузку картинок текущего и следующих слайдов."""
+        for slide in self.slides[self.idx:self.idx + 1 + PREFETCH_SLIDES]:
+            if slide.get("bg"):
+                self._ready(slide["bg"], self._bg_size, False)
+            if slide.get("portrait"):
+                self._ready(slide["portrait"], self._portrait_size, True)
+
+    def _next_target(self):
+        """Куда ведёт кат-сцена после последнего слайда: (класс, kwargs) или None."""
+        chapters = {"ch2": ("script_ch2.json", "maze"),
+                    "ch3": ("script_ch3.json", "rain"),
+                    "ch4": ("script_ch4.json", "coat")}
+        if self.next_scene_key in chapters:
+            script, nxt = chapters[self.next_scene_key]
+            return CutsceneScene, dict(state=self.state, script_file=script, next_scene=nxt)
+        try:
+            return _resolve_scene(self.next_scene_key), dict(state=self.state)
+        except KeyError:
+            return None
+
+    def next_targets(self):
+        target = self._next_target()
+        return [target] if target is not None else []
+
+    def _preload_next(self):
+        """Пока игрок читает, греем ресурсы следующей сцены."""
+        target = self._next_target()
+        if target is not None and hasattr(self.mgr, "preload"):
+            self.mgr.preload(target[0], **target[1])
+
+    def _ready(self, name, size, smooth):
+        key = (name, size, smooth)
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self._handles[key] = img_async(name, size, smooth)
+        return handle.ready
+
     # ---------- управление ----------
     def handle_event(self, e):
         if e.type in (pg.MOUSEBUTTONDOWN, pg.KEYDOWN):
@@ -63,33 +142,13 @@ class CutsceneScene(BaseScene):
 
             self.idx += 1
             self.alpha = 0
+            self._pin_slide()
+            self._prefetch()
             if self.idx >= len(self.slides):
-                if self.next_scene_key == "ch2":
-                    self.mgr.switch(
-                        CutsceneScene,
-                        state=self.state,
-                        script_file="script_ch2.json",  # если лежит в data/ch2, см. ниже
-                        next_scene="maze"  # дальше по твоему порядку
-                    )
-                    return
-                if self.next_scene_key == "ch3":
-                    self.mgr.switch(
-                        CutsceneScene,
-                        state=self.state,
-                        script_file="script_ch3.json",  # если лежит в data/ch2, см. ниже
-                        next_scene="rain"  # дальше по твоему порядку
-                    )
-                    return
-                if self.next_scene_key == "ch4":
-                    self.mgr.switch(
-                        CutsceneScene,
-                        state=self.state,
-                        script_file="script_ch4.json",  # если лежит в data/ch2, см. ниже
-                        next_scene="coat"  # дальше по твоему порядку
-                    )
-                    return
-                next_cls = _resolve_scene(self.next_scene_key)
-                self.mgr.switch(next_cls, state=self.state)
+                target = self._next_target()
+                if target is None:
+                    raise KeyError(self.next_scene_key)
+                self.mgr.switch(target[0], **target[1])
 
     # ---------- логика ----------
     def update(self, dt):
@@ -98,14 +157,40 @@ class CutsceneScene(BaseScene):
 
     # ---------- отрисовка ----------
     def draw(self):
-        self.screen.fill((0, 0, 0))
         slide = self.slides[self.idx]
+        bg_name = slide.get("bg")
+        portrait_name = slide.get("portrait")
+        # что видно на экране; если ничего не поменялось — слайд статичен
+        view = (self.idx,
+                self.alpha if slide.get("fx") == "fade" else 255,
+                bg_name,
+                bool(bg_name) and self._ready(bg_name, self._bg_size, False),
+                bool(portrait_name) and self._ready(portrait_name, self._portrait_size, True))
+        if not self.full_redraw and view == self._painted:
+            return []
+        prev, prev_rects = self._painted, self._painted_rects
+        self._painted = view
+        self._painted_rects = self._content_rects(slide)
+
+        # фон тот же и не гаснет — поменялись только панель с текстом и портрет:
+        # рисуем в их пределах и отдаём на экран только их
+        dirty = None
+        if (not self.full_redraw and prev is not None
+                and prev[1] == view[1] == 255 and prev[2:4] == view[2:4]):
+            dirty = prev_rects + self._painted_rects
+            if not dirty:
+                return []
+            self.screen.set_clip(dirty[0].unionall(dirty[1:]))
+
+        self.screen.fill((0, 0, 0))
 
         # фон
-        bg_name = slide.get("bg")
         if bg_name:
-            bg = img(bg_name)
-            self.screen.blit(pg.transform.scale(bg, (self._w, self._h)), (0, 0))
+            if self._ready(bg_name, self._bg_size, False):
+                bg = img_scaled(bg_name, self._bg_size, smooth=False)
+            else:
+                bg = placeholder((self._w, self._h), (12, 12, 16))
+            self.screen.blit(bg, (0, 0))
 
         # контент по типу
         if slide.get("type") == "dialog":
@@ -119,6 +204,23 @@ class CutsceneScene(BaseScene):
             overlay.fill((0, 0, 0, 255 - self.alpha))
             self.screen.blit(overlay, (0, 0))
 
+        self.screen.set_clip(None)
+        return dirty
+
+    def _content_rects(self, slide) -> list[pg.Rect]:
+        """Области поверх фона, которые занимает слайд: панель текста и портрет."""
+        w, h = self._w, self._h
+        if slide.get("type") != "dialog":
+            return [pg.Rect(0, h - 96, w, 96)] if slide.get("text") else []
+        panel_h = int(h * 0.17)
+        rects = [pg.Rect(0, h - panel_h, w, panel_h)]
+        portrait_name = slide.get("portrait")
+        if portrait_name and self._ready(portrait_name, self._portrait_size, True):
+            p = img_scaled(portrait_name, self._portrait_size)
+            y = h - panel_h - int(self._portrait_size[1] * 0.75)
+            rects.append(p.get_rect(topleft=(0, y)).clip(self.screen.get_rect()))
+        return rects
+
     # ---------- виды слайдов ----------
     def _draw_plain(self, slide):
         text = slide.get("text", "")
@@ -139,11 +241,9 @@ class CutsceneScene(BaseScene):
         # --- PORTRET СЛЕВА, СЗАДИ ПАНЕЛИ ---
         portrait_name = slide.get("portrait")
         text_left = 34
-        if portrait_name:
-            p = img(portrait_name)
-            target_h = int(panel_h * 4.5)  # крупнее панели
-            target_w = int(p.get_width() * (target_h / p.get_height()))
-            p = pg.transform.smoothscale(p, (target_w, target_h))
+        if portrait_name and self._ready(portrait_name, self._portrait_size, True):
+            target_h = self._portrait_size[1]  # крупнее панели: 4.5 высоты панели
+            p = img_scaled(portrait_name, self._portrait_size)
             x_portrait = 0  # всегда слева
             y_portrait = h - panel_h - int(target_h * 0.75)  # выступает вверх
             # рисуем ПЕРВЫМ, чтобы потом панель легла сверху
@@ -165,38 +265,10 @@ class CutsceneScene(BaseScene):
         self._blit_wrapped_colored(text, (text_left, panel_rect.y + 44),
                                    w - 28 - text_left, (230, 230, 230))
 
-    # перенос строк по ширине
+    # перенос строк по ширине (раскладка кэшируется — один раз на слайд)
     def _blit_wrapped(self, text, pos, max_w):
-        x, y = pos
-        words = str(text).split()
-        line = ""
-        for w in words:
-            test = (line + " " + w).strip()
-            surf = self.font_text.render(test, True, (255, 255, 255))
-            if surf.get_width() > max_w and line:
-                self.screen.blit(self.font_text.render(line, True, (255, 255, 255)), (x, y))
-                y += 28
-                line = w
-            else:
-                line = test
-        if line:
-            self.screen.blit(self.font_text.render(line, True, (255, 255, 255)), (x, y))
-
-    # Внутри класса CutsceneScene, ниже _draw_dialog / _draw_plain:
+        layout(text, self.font_text, max_w, (255, 255, 255), line_height=28).blit(self.screen, pos)
 
     def _blit_wrapped_colored(self, text, pos, max_w, color):
         """Рисует многострочный текст заданным цветом с переносами по ширине."""
-        x, y = pos
-        words = str(text).split()
-        line = ""
-        for w in words:
-            test = (line + " " + w).strip()
-            surf = self.font_text.render(test, True, color)
-            if surf.get_width() > max_w and line:
-                self.screen.blit(self.font_text.render(line, True, color), (x, y))
-                y += int(self.font_text.get_height() * 1.05)
-                line = w
-            else:
-                line = test
-        if line:
-            self.screen.blit(self.font_text.render(line, True, color), (x, y))
+        layout(text, self.font_text, max_w, color, line_spacing=1.05).blit(self.screen, pos)
@@ -1,29 +1,101 @@
 import os, random
 import pygame as pg
+from collections import OrderedDict
 from core.base_scene import BaseScene
 from scenes.cutscene import CutsceneScene
 from core.anim import AnimatedSprite  # <-- добавили
 from core.ui import TOASTS            # для тоста при победе
+from core.text import render
+from core.maze import MazeLevel, SLOW_FACTOR, generate
 
 TILE = 32
+GENERATED_SIZE = (61, 33)  # размер карты по умолчанию, если её генерируем (в клетках)
+CHUNK_TILES = 16  # статичный слой карты режется на куски CHUNK_TILES x CHUNK_TILES клеток
+MAX_CHUNKS = 24   # сколько готовых кусков держим (LRU): экран 960x540 — до 6 кусков, это ~4 экрана
+
+FLOOR_COLOR = (10, 10, 14)
+TILE_COLORS = {'#': (40, 40, 60), '~': (30, 70, 70)}
+
+class TileChunks:
+    """
+    Статичный слой лабиринта, отрисованный кусками. Кусок рисуется один раз
+    при первом попадании в кадр, дальше — только blit видимых кусков,
+    так что стоимость кадра не зависит от размера карты. Готовых кусков
+    не больше max_chunks: давно не видимые выбрасываются (LRU), поэтому
+    и память не растёт, сколько бы игрок ни исследовал большую карту.
+    """
+
+    def __init__(self, grid, tile=TILE, chunk_tiles=CHUNK_TILES, max_chunks=MAX_CHUNKS):
+        self.grid = grid
+        self.tile = tile
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = tile * chunk_tiles
+        self.size = (max(len(r) for r in grid) * tile, len(grid) * tile)
+        self.max_chunks = max_chunks
+        self.chunks: OrderedDict[tuple[int, int], pg.Surface] = OrderedDict()
+
+    def _render(self, cx, cy):
+        n, t = self.chunk_tiles, self.tile
+        surf = pg.Surface((self.chunk_px, self.chunk_px)).convert()
+        surf.fill(FLOOR_COLOR)
+        for y, row in enumerate(self.grid[cy*n:(cy+1)*n]):
+            for x, ch in enumerate(row[cx*n:(cx+1)*n]):
+                color = TILE_COLORS.get(ch)
+                if color:
+                    surf.fill(color, (x * t, y * t, t, t))
+        self.chunks[(cx, cy)] = surf
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return surf
+
+    def draw(self, surface: pg.Surface, camera):
+        cam_x, cam_y = int(camera[0]), int(camera[1])
+        sw, sh = surface.get_size()
+        wx, wy = self.size
+        cp = self.chunk_px
+        x0, y0 = max(0, cam_x) // cp, max(0, cam_y) // cp
+        x1 = (min(wx, cam_x + sw) - 1) // cp
+        y1 = (min(wy, cam_y + sh) - 1) // cp
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is None:
+                    chunk = self._render(cx, cy)
+                else:
+                    self.chunks.move_to_end((cx, cy))
+                surface.blit(chunk, (cx * cp - cam_x, cy * cp - cam_y))
 
-def load_level(path):
-    with open(path, "r", encoding="utf-8") as f:
-        rows = [line.rstrip("\n") for line in f if line.strip()]
-    width = max(len(r) for r in rows)
-    rows = [r.ljust(width, "#") for r in rows]
-    return rows
 
 class MazeGame(BaseScene):
-    def __init__(self, manager, state):
+    @classmethod
+    def preload_assets(cls, screen_size, **kwargs):
+        return AnimatedSprite.asset_names("character")
+
+    def __init__(self, manager, state, seed=None, size=None):
         super().__init__(manager)
         self.state = state
-
-        # выбираем одну из карт случайно
-        maze_files = [f for f in os.listdir("data/maze") if f.startswith("maze") and f.endswith(".txt")]
-        chosen = random.choice(maze_files)
-
-        self.grid = load_level(os.path.join("data/maze", chosen))
+        self.level = None
+
+        if seed is None and size is None:
+            # выбираем одну из карт случайно; непроходимые (S не дойти до E) пропускаем
+            maze_files = [f for f in os.listdir("data/maze") if f.startswith("maze") and f.endswith(".txt")]
+            random.shuffle(maze_files)
+            for chosen in maze_files:
+                level = MazeLevel.load(os.path.join("data/maze", chosen))
+                if level.solvable():
+                    self.level = level
+                    break
+                print(f"Maze {chosen}: exit is unreachable from start, skipping")
+        if self.level is None:
+            # карта на лету: по seed/size или когда готовых годных карт нет
+            w, h = size or GENERATED_SIZE
+            # поле расстояний досчитывается по кадрам в update(), чтобы не тормозить вход в сцену
+            self.level = MazeLevel(generate(w, h, seed), lazy=True)
+
+        self.grid = self.level.grid
+        self.show_hint = False
+        self.tiles = TileChunks(self.grid)
+        self.camera = pg.Vector2(0, 0)
         spawn = self.find('S')
         self.exit = self.find('E')
         self.speed = 150.0
@@ -51,7 +123,23 @@ class MazeGame(BaseScene):
     def passable(self, x, y):
         return self.tile_at(x, y) != '#'
 
+    def _follow_camera(self):
+        """Камера держит игрока в центре, не выходя за края карты."""
+        sw, sh = self.screen.get_size()
+        ww, wh = self.tiles.size
+        self.camera.x = max(0, min(ww - sw, self.player.pos.x - sw / 2)) if ww > sw else 0
+        self.camera.y = max(0, min(wh - sh, self.player.pos.y - sh / 2)) if wh > sh else 0
+
+    def handle_event(self, e):
+        if e.type == pg.KEYDOWN and e.key == pg.K_h:
+            self.show_hint = not self.show_hint
+
+    def _player_cell(self):
+        return int(self.player.pos.x // TILE), int(self.player.pos.y // TILE)
+
     def update(self, dt):
+        if not self.level.ready:
+            self.level.advance()
         keys = pg.key.get_pressed()
         vx = (keys[pg.K_d] or keys[pg.K_RIGHT]) - (keys[pg.K_a] or keys[pg.K_LEFT])
         vy = (keys[pg.K_s] or keys[pg.K_DOWN]) - (keys[pg.K_w] or keys[pg.K_UP])
@@ -67,7 +155,7 @@ class MazeGame(BaseScene):
 
         # скорость с учётом замедляющих тайлов
         tile_here = self.tile_at(self.player.pos.x, self.player.pos.y)
-        slow = 0.65 if tile_here == '~' else 1.0
+        slow = SLOW_FACTOR if tile_here == '~' else 1.0
         speed = self.speed * slow
 
         # движение с поочерёдной проверкой коллизий по осям
@@ -102,20 +190,39 @@ class MazeGame(BaseScene):
                             script_file="ch2/script_ch2_messages.json", next_scene="oracle")
 
     def draw(self):
-        self.screen.fill((10, 10, 14))
-        for y, row in enumerate(self.grid):
-            for x, ch in enumerate(row):
-                r = pg.Rect(x * TILE, y * TILE, TILE, TILE)
-                if ch == '#':
-                    pg.draw.rect(self.screen, (40, 40, 60), r)
-                elif ch == '~':
-                    pg.draw.rect(self.screen, (30, 70, 70), r)
+        self._follow_camera()
+        cam = (int(self.camera.x), int(self.camera.y))
+        ww, wh = self.tiles.size
+        sw, sh = self.screen.get_size()
+        if ww - cam[0] < sw or wh - cam[1] < sh:
+            self.screen.fill(FLOOR_COLOR)  # карта меньше экрана — под ней пол
+        self.tiles.draw(self.screen, cam)
 
         # выход и игрок-спрайт
         if self.exit:
-            pg.draw.circle(self.screen, (120, 200, 160), (int(self.exit.x), int(self.exit.y)), 10)
-        self.player.draw(self.screen)
-
-        tip = pg.font.SysFont(None, 22).render("WASD — движение; проводи Варюшу до дома", True,
-                                               (210, 210, 210))
+            pg.draw.circle(self.screen, (120, 200, 160), (int(self.exit.x) - cam[0], int(self.exit.y) - cam[1]), 10)
+        if self.show_hint:
+            self._draw_hint(cam)
+        self.player.draw(self.screen, cam)
+
+        # прогресс по полю расстояний: сколько пути до дома уже пройдено
+        if self.level.ready:
+            pct = int(self.level.progress(*self._player_cell()) * 100)
+            self.screen.blit(render(f"Путь: {pct}%", 22, (210, 210, 210)), (30, 16))
+        tip = render("WASD — движение, H — подсказка; проводи Варюшу до дома", 22, (210, 210, 210))
         self.screen.blit(tip, (30, 500))
+
+    def _draw_hint(self, cam):
+        """Стрелка из клетки игрока в соседнюю клетку, ближайшую к выходу."""
+        cx, cy = self._player_cell()
+        step = self.level.hint(cx, cy)
+        if step is None:
+            return
+        dx, dy, _name = step
+        x0 = cx * TILE + TILE // 2 - cam[0]
+        y0 = cy * TILE + TILE // 2 - cam[1]
+        tip = pg.Vector2(x0 + dx * TILE, y0 + dy * TILE)
+        side = pg.Vector2(-dy, dx) * 6
+        back = tip - pg.Vector2(dx, dy) * 10
+        pg.draw.line(self.screen, (255, 220, 120), (x0, y0), back, 3)
+        pg.draw.polygon(self.screen, (255, 220, 120), (tip, back + side, back - side))
@@ -1,10 +1,13 @@
 import pygame as pg
 from core.base_scene import BaseScene
 from core.ui import Button
+from core import bullets
 from core.state import GameState
 from scenes.cutscene import CutsceneScene
 from scenes.achievements_view import AchievementsView
 
+BG = (12, 12, 16)
+
 
 class MenuScene(BaseScene):
     def __init__(self, manager):
@@ -18,8 +21,13 @@ class MenuScene(BaseScene):
                     CutsceneScene, state=self.state, script_file="ch1/script_ch1.json", next_scene="concert")),
                 Button((cx - 120, 240, 240, 48), "Продолжить", self._resume),
                 Button((cx - 120, 300, 240, 48), "Ачивки", lambda: self.mgr.switch(AchievementsView, state=self.state)),
-                Button((cx - 120, 360, 240, 48), "Выход", lambda: pg.event.post(pg.event.Event(pg.QUIT)))
             ]
+            # бонус: «Оракул» в режиме bullet hell — после того, как его прошли
+            if "pryaniki" in self.state.achievements and bullets.AVAILABLE:
+                self.buttons.append(Button((cx - 120, 360, 240, 48), "Ад пуль", self._bullet_hell))
+            y = 360 + 60 * (len(self.buttons) - 3)
+            self.buttons.append(Button((cx - 120, y, 240, 48), "Выход",
+                                       lambda: pg.event.post(pg.event.Event(pg.QUIT))))
         else:
             self.buttons = [
                 Button((cx - 120, 180, 240, 48), "Начать", lambda: self.mgr.switch(
@@ -32,13 +40,28 @@ class MenuScene(BaseScene):
         for b in self.buttons: b.handle_event(e)
 
     def draw(self):
-        self.screen.fill((12,12,16))
-        for b in self.buttons: b.draw(self.screen)
+        # меню статично: целиком рисуем только по запросу, дальше — лишь кнопки,
+        # у которых сменилась подсветка под курсором
+        if self.full_redraw:
+            self.screen.fill(BG)
+            for b in self.buttons: b.draw(self.screen)
+            self._hovered = [b.hover for b in self.buttons]
+            return None
+        changed = [b for b, h in zip(self.buttons, self._hovered) if b.hover != h]
+        for b in changed:
+            self.screen.fill(BG, b.rect)
+            b.draw(self.screen)
+        self._hovered = [b.hover for b in self.buttons]
+        return [b.rect for b in changed]
 
     def check_achievements(self):
         self.state.load()
         return len(self.state.achievements) > 0
 
+    def _bullet_hell(self):
+        from scenes.oracle_game import OracleGame
+        self.mgr.switch(OracleGame, state=self.state, bullet_hell=True)
+
     def _resume(self):
         from scenes.cutscene import CutsceneScene
         try:
@@ -2,9 +2,104 @@
 import random
 import pygame as pg
 from core.base_scene import BaseScene
+from core.text import render
+from core import bullets
 
 RND = random.Random()
 
+
+class Formation:
+    """
+    Строй врагов rows x cols, который двигается целиком.
+    Позиция врага — начало строя (x, y) плюс его клетка в сетке, так что
+    сдвиг строя — O(1). По колонкам и рядам храним число живых и нижнего
+    живого в колонке, по ним же — крайние живые колонки/ряды: рамка строя,
+    выбор стрелка и попадание пули не перебирают всю сетку.
+    """
+
+    def __init__(self, rows, cols, x, y, spacing=(48, 36), size=(28, 18)):
+        self.rows, self.cols = rows, cols
+        self.x, self.y = x, y
+        self.sx, self.sy = spacing
+        self.ew, self.eh = size
+        self.alive = [[True] * cols for _ in range(rows)]
+        self.col_count = [rows] * cols
+        self.row_count = [cols] * rows
+        self.col_bottom = [rows - 1] * cols   # индекс нижнего живого ряда в колонке, -1 — пусто
+        self.count = rows * cols
+        # крайние непустые колонки и ряды (включительно)
+        self.c0, self.c1 = 0, cols - 1
+        self.r0, self.r1 = 0, rows - 1
+
+    def rect(self, r, c) -> pg.Rect:
+        return pg.Rect(self.x + c * self.sx, self.y + r * self.sy, self.ew, self.eh)
+
+    def living(self):
+        """(ряд, колонка) живых врагов — только внутри рамки."""
+        for r in range(self.r0, self.r1 + 1):
+            if self.row_count[r]:
+                row = self.alive[r]
+                for c in range(self.c0, self.c1 + 1):
+                    if row[c]:
+                        yield r, c
+
+    def bounds(self):
+        """Прямоугольник вокруг всех живых врагов или None."""
+        if not self.count:
+            return None
+        left = self.x + self.c0 * self.sx
+        top = self.y + self.r0 * self.sy
+        return pg.Rect(left, top, (self.c1 - self.c0) * self.sx + self.ew,
+                       (self.r1 - self.r0) * self.sy + self.eh)
+
+    def kill(self, r, c):
+        self.alive[r][c] = False
+        self.count -= 1
+        self.col_count[c] -= 1
+        self.row_count[r] -= 1
+        if self.col_bottom[c] == r:
+            b = r - 1
+            while b >= 0 and not self.alive[b][c]:
+                b -= 1
+            self.col_bottom[c] = b
+        if not self.count:
+            return
+        # рамка только сужается, так что сдвиги суммарно O(rows + cols) за игру
+        while not self.col_count[self.c0]:
+            self.c0 += 1
+        while not self.col_count[self.c1]:
+            self.c1 -= 1
+        while not self.row_count[self.r0]:
+            self.r0 += 1
+        while not self.row_count[self.r1]:
+            self.r1 -= 1
+
+    def _span(self, lo, hi, origin, step, size, n):
+        """Индексы клеток по одной оси, которые задевает отрезок [lo, hi)."""
+        a = max(0, (lo - origin) // step)
+        b = min(n - 1, (hi - 1 - origin) // step)
+        return [i for i in range(a, b + 1) if lo < origin + i * step + size and origin + i * step < hi]
+
+    def hit(self, rect):
+        """Убить врага, которого задевает rect (нижнего, если таких несколько). True — попали."""
+        for c in self._span(rect.left, rect.right, self.x, self.sx, self.ew, self.cols):
+            if not self.col_count[c]:
+                continue
+            for r in reversed(self._span(rect.top, rect.bottom, self.y, self.sy, self.eh, self.rows)):
+                if self.alive[r][c]:
+                    self.kill(r, c)
+                    return True
+        return False
+
+    def shooter(self, rng):
+        """Прямоугольник нижнего живого врага в случайной непустой колонке."""
+        cols = [c for c in range(self.c0, self.c1 + 1) if self.col_count[c]]
+        if not cols:
+            return None
+        c = rng.choice(cols)
+        return self.rect(self.col_bottom[c], c)
+
+
 class OracleGame(BaseScene):
     """
     Мини-игра «Оракул» (Space Invaders):
@@ -13,6 +108,11 @@ class OracleGame(BaseScene):
     - Враги иногда стреляют вниз.
     - Победа: все враги уничтожены → ачивка + кат-сцена.
     - Поражение: враги добрались до низа / попали в игрока → retry-кат-сцена.
+
+    bullet_hell=True (нужен NumPy) — плотный режим: строй больше, враги залпами
+    выпускают веера пуль, игрок стреляет веером, пока зажат SPACE. Пули живут
+    в core.bullets.BulletField — тысячи штук двигаются и проверяются векторно.
+    В игре режим открывается кнопкой «Ад пуль» в меню после ачивки «Пряники».
     """
 
     # --- параметры геймплея (можно вынести в JSON при желании) ---
@@ -31,14 +131,29 @@ class OracleGame(BaseScene):
 
     SHIELD_COUNT = 0      # если захочешь щиты — сделаем
 
-    def __init__(self, manager, state):
+    # --- режим bullet hell ---
+    HELL_ROWS = 6
+    HELL_COLS = 16
+    HELL_FIRE_PERIOD = 0.04     # залп всех нижних врагов раз в столько секунд
+    HELL_FAN = 11               # пуль в веере одного врага
+    HELL_SPREAD = 0.9           # полуширина веера, радианы
+    HELL_BULLET_SPEED = 200.0
+    HELL_PLAYER_COOLDOWN = 0.08
+    HELL_PLAYER_FAN = 5
+    HELL_INVULN = 1.2           # неуязвимость после попадания, секунды
+
+    def __init__(self, manager, state, bullet_hell=False):
         super().__init__(manager)
         self.state = state
+        self.hell = bullet_hell and bullets.AVAILABLE
+        if bullet_hell and not self.hell:
+            print("OracleGame: bullet hell mode needs NumPy, falling back to the normal mode")
 
         w, h = self.screen.get_size()
 
         # Игрок
         self.player = pg.Rect(w//2 - 18, h - 64, 36, 16)
+        self.player_x = float(self.player.x)
         self.player_cooldown = 0.0
         self.lives = self.PLAYER_LIVES
         self.score = 0
@@ -47,22 +162,26 @@ class OracleGame(BaseScene):
         self.bullets = []         # list[pg.Rect] — вверх
         self.enemy_bullets = []   # вниз
 
-        # Враги — сетка прямоугольников
-        self.enemies = []
-        margin_x, margin_y = 80, 80
-        spacing_x, spacing_y = 48, 36
-        for r in range(self.ENEMY_ROWS):
-            row = []
-            for c in range(self.ENEMY_COLS):
-                x = margin_x + c * spacing_x
-                y = margin_y + r * spacing_y
-                row.append(pg.Rect(x, y, 28, 18))
-            self.enemies.append(row)
+        # Враги — строй с отступом 80 px от угла
+        if self.hell:
+            self.enemies = Formation(self.HELL_ROWS, self.HELL_COLS, 80, 80)
+            self.shots = bullets.BulletField((4, 10))
+            self.enemy_shots = bullets.BulletField((6, 6), capacity=8192)
+            self.shot_sprite = bullets.bullet_sprite((4, 10), (255, 245, 140))
+            self.enemy_shot_sprite = bullets.bullet_sprite((6, 6), (255, 120, 110), radius=3)
+            self.hell_timer = self.HELL_FIRE_PERIOD
+            self.hell_phase = 0.0
+            self.invuln = 0.0
+        else:
+            self.enemies = Formation(self.ENEMY_ROWS, self.ENEMY_COLS, 80, 80)
 
         self.enemy_dir = 1      # 1 вправо, -1 влево
         self.enemy_speed = self.ENEMY_HSP
         self.enemy_fire_timer = self._rand_enemy_fire_time()
 
+        # дробные остатки смещений: на мелком шаге int(v*dt) обнуляет скорость
+        self._frac = {"bullets": 0.0, "enemy_bullets": 0.0, "enemies": 0.0}
+
         # Вступительная заставка (если подключила MiniIntro)
         try:
             from core.ui import MiniIntro
@@ -79,22 +198,12 @@ class OracleGame(BaseScene):
         a, b = self.ENEMY_FIRE_COOLDOWN
         return RND.uniform(a, b)
 
-    def _all_enemies(self):
-        for row in self.enemies:
-            for e in row:
-                if e:  # Rect или None
-                    yield e
-
-    def _enemies_rect_bounds(self):
-        # прямоугольник, ограничивающий всех живых врагов
-        living = [e for e in self._all_enemies()]
-        if not living:
-            return None
-        left = min(e.left for e in living)
-        right = max(e.right for e in living)
-        top = min(e.top for e in living)
-        bottom = max(e.bottom for e in living)
-        return pg.Rect(left, top, right-left, bottom-top)
+    def _whole_px(self, key, delta):
+        """Целая часть смещения за шаг; дробная копится до следующего шага."""
+        total = self._frac[key] + delta
+        px = int(total)
+        self._frac[key] = total - px
+        return px
 
     # ------------- events -------------
     def handle_event(self, e):
@@ -103,7 +212,8 @@ class OracleGame(BaseScene):
             self.intro.handle_event(e)
             return
 
-        if e.type == pg.KEYDOWN and e.key == pg.K_SPACE and self.player_cooldown <= 0:
+        # в режиме bullet hell стрельба — по зажатому SPACE, в update()
+        if e.type == pg.KEYDOWN and e.key == pg.K_SPACE and self.player_cooldown <= 0 and not self.hell:
             # выстрел игрока
             self.player_cooldown = self.PLAYER_COOLDOWN
             b = pg.Rect(self.player.centerx - 2, self.player.top - 10, 4, 10)
@@ -121,81 +231,48 @@ class OracleGame(BaseScene):
 
         # Движение игрока
         vx = (keys[pg.K_d] or keys[pg.K_RIGHT]) - (keys[pg.K_a] or keys[pg.K_LEFT])
-        self.player.x += int(vx * self.PLAYER_SPEED * dt)
-        self.player.clamp_ip(pg.Rect(8, 0, w-16, h))
+        self.player_x += vx * self.PLAYER_SPEED * dt
+        self.player_x = max(8.0, min(w - 8 - self.player.width, self.player_x))
+        self.player.x = int(self.player_x)
 
         # Кулдаун стрельбы
         if self.player_cooldown > 0:
             self.player_cooldown -= dt
 
+        # Движение врагов; поражение: враги добрались до низа
+        if self._move_enemies(dt, w):
+            self._lose()
+            return
+
+        if self.hell:
+            self._update_hell(dt, keys, w, h)
+            return
+
         # Движение пуль игрока
+        dy = self._whole_px("bullets", self.BULLET_SPEED * dt)
         for b in self.bullets:
-            b.y -= int(self.BULLET_SPEED * dt)
+            b.y -= dy
         self.bullets = [b for b in self.bullets if b.bottom > 0]
 
-        # Движение врагов
-        bounds = self._enemies_rect_bounds()
-        if bounds:
-            need_turn = (bounds.right + int(self.enemy_speed * self.enemy_dir * dt) > w-8) or \
-                        (bounds.left + int(self.enemy_speed * self.enemy_dir * dt) < 8)
-            if need_turn:
-                self.enemy_dir *= -1
-                # опускаем всех на шаг вниз и ускоряемся чуть-чуть
-                for e in self._all_enemies():
-                    e.y += self.ENEMY_Y_STEP
-                self.enemy_speed *= 1.06
-                bounds = self._enemies_rect_bounds()
-
-            # горизонтальное смещение
-            dx = int(self.enemy_speed * self.enemy_dir * dt)
-            if dx:
-                for e in self._all_enemies():
-                    e.x += dx
-
-            # поражение: враги добрались до низа
-            if bounds and bounds.bottom >= self.player.top - 10:
-                self._lose()
-                return
-
         # Стрельба врагов (случайно, но из нижней живой в колонке)
         self.enemy_fire_timer -= dt
-        if self.enemy_fire_timer <= 0 and bounds:
+        if self.enemy_fire_timer <= 0 and self.enemies.count:
             self.enemy_fire_timer = self._rand_enemy_fire_time()
-            # выберем случайную колонку, найдём в ней нижнего живого
-            cols = {}
-            for r in range(self.ENEMY_ROWS):
-                for c in range(self.ENEMY_COLS):
-                    e = self.enemies[r][c]
-                    if e:
-                        cols.setdefault(c, []).append((r, e))
-            if cols:
-                c = RND.choice(list(cols.keys()))
-                # нижний = с максимальным y
-                r, e = max(cols[c], key=lambda it: it[1].bottom)
+            e = self.enemies.shooter(RND)
+            if e:
                 bullet = pg.Rect(e.centerx - 2, e.bottom + 2, 4, 10)
                 self.enemy_bullets.append(bullet)
 
         # Движение пуль врага
+        dy = self._whole_px("enemy_bullets", self.ENEMY_BULLET_SPEED * dt)
         for eb in self.enemy_bullets:
-            eb.y += int(self.ENEMY_BULLET_SPEED * dt)
+            eb.y += dy
         self.enemy_bullets = [eb for eb in self.enemy_bullets if eb.top < h]
 
-        # Коллизии «пуля игрока → враг»
+        # Коллизии «пуля игрока → враг»: проверяем только колонку под пулей
         for b in self.bullets[:]:
-            hit = False
-            # ускоренная проверка: по рядам
-            for r in range(self.ENEMY_ROWS):
-                row = self.enemies[r]
-                for c in range(self.ENEMY_COLS):
-                    e = row[c]
-                    if e and b.colliderect(e):
-                        row[c] = None
-                        hit = True
-                        self.score += 10
-                        break
-                if hit:
-                    break
-            if hit:
+            if self.enemies.hit(b):
+                self.score += 10
                 self.bullets.remove(b)
 
         # Коллизии «пуля врага → игрок»
@@ -208,11 +285,116 @@ class OracleGame(BaseScene):
                     return
 
         # Победа?
-        any_left = any(e for e in self._all_enemies())
-        if not any_left:
+        if not self.enemies.count:
             self._win()
             return
 
+    def _move_enemies(self, dt, w) -> bool:
+        """Сдвинуть строй (с отскоком от стен). True — строй дошёл до игрока."""
+        bounds = self.enemies.bounds()
+        if not bounds:
+            return False
+        step = self.enemy_speed * self.enemy_dir * dt
+        need_turn = (bounds.right + step > w-8) or (bounds.left + step < 8)
+        if need_turn:
+            self.enemy_dir *= -1
+            # опускаем всех на шаг вниз и ускоряемся чуть-чуть
+            self.enemies.y += self.ENEMY_Y_STEP
+            self.enemy_speed *= 1.06
+            self._frac["enemies"] = 0.0
+            bounds = self.enemies.bounds()
+
+        # горизонтальное смещение
+        self.enemies.x += self._whole_px("enemies", self.enemy_speed * self.enemy_dir * dt)
+        return bounds.bottom >= self.player.top - 10
+
+    # ------------- bullet hell -------------
+    def _update_hell(self, dt, keys, w, h):
+        np = bullets.np
+        screen = pg.Rect(0, 0, w, h)
+        if self.invuln > 0:
+            self.invuln -= dt
+
+        # игрок: веер вверх, пока зажат SPACE
+        if keys[pg.K_SPACE] and self.player_cooldown <= 0:
+            self.player_cooldown = self.HELL_PLAYER_COOLDOWN
+            ang = np.linspace(-0.15, 0.15, self.HELL_PLAYER_FAN)
+            self.shots.spawn(self.player.centerx - 2, self.player.top - 10,
+                             np.sin(ang) * self.BULLET_SPEED, -np.cos(ang) * self.BULLET_SPEED)
+
+        # враги: все нижние в колонках стреляют веерами, веер покачивается
+        self.hell_timer -= dt
+        while self.hell_timer <= 0:
+            self.hell_timer += self.HELL_FIRE_PERIOD
+            self._hell_volley()
+
+        self.shots.step(dt)
+        self.shots.cull(screen)
+        self.enemy_shots.step(dt)
+        self.enemy_shots.cull(screen)
+
+        self._hell_hits()
+
+        hit = self.enemy_shots.overlaps(self.player)
+        if hit.any():
+            self.enemy_shots.keep(~hit)
+            if self.invuln <= 0:
+                self.invuln = self.HELL_INVULN
+                self.lives -= 1
+                if self.lives <= 0:
+                    self._lose()
+                    return
+
+        if not self.enemies.count:
+            self._win()
+
+    def _hell_volley(self):
+        np = bullets.np
+        f = self.enemies
+        cols = np.flatnonzero(f.col_count)
+        if not cols.size:
+            return
+        rows = np.asarray(f.col_bottom)[cols]
+        x = f.x + cols * f.sx + (f.ew - self.enemy_shots.w) / 2
+        y = f.y + rows * f.sy + f.eh
+        self.hell_phase += 0.3
+        ang = np.linspace(-self.HELL_SPREAD, self.HELL_SPREAD, self.HELL_FAN) \
+            + 0.5 * self.HELL_SPREAD * np.sin(self.hell_phase)
+        v = self.HELL_BULLET_SPEED
+        self.enemy_shots.spawn(x[:, None], y[:, None], (np.sin(ang) * v)[None, :], (np.cos(ang) * v)[None, :])
+
+    def _hell_hits(self):
+        """
+        Пули игрока против строя без перебора врагов: пулю переводим в клетку
+        сетки. Клетка, расширенная на размер пули, меньше шага сетки, так что
+        попадание в «расширенную» клетку — ровно AABB-пересечение с её врагом.
+        """
+        np = bullets.np
+        f, s = self.enemies, self.shots
+        if not s.n:
+            return
+        p = s.pos[:s.n]
+        u = p[:, 0] + s.w - f.x
+        v = p[:, 1] + s.h - f.y
+        c = np.floor_divide(u, f.sx).astype(np.int32)
+        r = np.floor_divide(v, f.sy).astype(np.int32)
+        mask = ((c >= 0) & (c < f.cols) & (r >= 0) & (r < f.rows) &
+                (u - c * f.sx > 0) & (u - c * f.sx < f.ew + s.w) &
+                (v - r * f.sy > 0) & (v - r * f.sy < f.eh + s.h))
+        if not mask.any():
+            return
+        alive = np.asarray(f.alive, dtype=bool)
+        idx = np.flatnonzero(mask)
+        idx = idx[alive[r[idx], c[idx]]]
+        if not idx.size:
+            return
+        for cell in np.unique(r[idx] * f.cols + c[idx]).tolist():
+            f.kill(*divmod(cell, f.cols))
+            self.score += 10
+        mask[:] = False
+        mask[idx] = True
+        s.keep(~mask)
+
     # ------------- outcomes -------------
     def _win(self):
         # ачивка и переход
@@ -230,6 +412,10 @@ class OracleGame(BaseScene):
                         script_file="script_ch2_birthday.json", next_scene="maze")
 
     def _lose(self):
+        if self.hell:
+            # ретрай сразу в тот же режим: кат-сцена по ключу "oracle" его бы потеряла
+            self.mgr.switch(OracleGame, state=self.state, bullet_hell=True)
+            return
         from scenes.cutscene import CutsceneScene
         # простая ретрай-заставка → вернуться в «Оракул»
         self.mgr.switch(CutsceneScene, state=self.state,
@@ -241,24 +427,30 @@ class OracleGame(BaseScene):
         w, h = self.screen.get_size()
 
         # враги
-        for e in self._all_enemies():
-            pg.draw.rect(self.screen, (160, 200, 255), e, border_radius=3)
+        for r, c in self.enemies.living():
+            pg.draw.rect(self.screen, (160, 200, 255), self.enemies.rect(r, c), border_radius=3)
 
         # пули
+        if self.hell:
+            self.shots.draw(self.screen, self.shot_sprite)
+            self.enemy_shots.draw(self.screen, self.enemy_shot_sprite)
         for b in self.bullets:
             pg.draw.rect(self.screen, (255, 245, 140), b, border_radius=2)
         for eb in self.enemy_bullets:
             pg.draw.rect(self.screen, (255, 120, 110), eb, border_radius=2)
 
-        # игрок
-        pg.draw.rect(self.screen, (110, 255, 160), self.player, border_radius=3)
+        # игрок (мигает, пока неуязвим после попадания)
+        if not (self.hell and self.invuln > 0 and int(self.invuln * 10) % 2):
+            pg.draw.rect(self.screen, (110, 255, 160), self.player, border_radius=3)
 
         # HUD
-        f = pg.font.SysFont(None, 22)
-        self.screen.blit(f.render(f"Счёт: {self.score}", True, (220,220,230)), (14, 10))
+        self.screen.blit(render(f"Счёт: {self.score}", 22, (220,220,230)), (14, 10))
         lives_txt = "Жизни: " + "❤ " * max(0, self.lives)
-        self.screen.blit(f.render(lives_txt, True, (255,140,160)), (14, 34))
-        self.screen.blit(f.render("← → — движение, SPACE — выстрел", True, (200,200,210)), (14, h-28))
+        self.screen.blit(render(lives_txt, 22, (255,140,160)), (14, 34))
+        if self.hell:
+            self.screen.blit(render(f"Пуль: {len(self.shots) + len(self.enemy_shots)}", 22, (200,200,210)),
+                             (14, 58))
+        self.screen.blit(render("← → — движение, SPACE — выстрел", 22, (200,200,210)), (14, h-28))
 
         # Заставка (если активна)
         if self.intro and not self.intro.done:
@@ -2,8 +2,10 @@
 from __future__ import annotations
 import random
 import pygame as pg
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from core.base_scene import BaseScene
+from core.text import render
 
 RND = random.Random()
 
@@ -19,9 +21,12 @@ OB_SPAWN_EVERY      = 0.65      # интервал спавна «потоков
 OB_SPEED_MIN        = 120.0     # горизонтальная скорость людей
 OB_SPEED_MAX        = 260.0
 OB_WIDTH_RANGE      = (36, 64)  # «ширина человека»
+OB_PERSON_H         = 40        # «высота человека»
+OB_WRAP_GAP         = 120       # пустой промежуток, после которого ряд повторяется
 OB_LANE_H           = 58        # расстояние между «дорожками» (по Y)
 OB_ROWS_AHEAD       = 12        # сколько рядов держим «в трубе» перед игроком
 HIT_GRACE           = 4         # прощаем небольшое касание
+ROW_BASE_Y_K        = 0.18      # доля высоты экрана, на которой стоит ряд с мировой y = -world_y
 
 HARD_CHANCE_PER_MIN = 0.25      # как часто добавлять «двойные» потоки
 
@@ -33,8 +38,36 @@ class Crowd:
     y: float
     dir: int              # -1 влево, +1 вправо
     speed: float          # px/s (модуля)
-    gaps: list[pg.Rect]   # прямоугольники-люди в локальных координатах (x0..x1, y=0)
+    gaps: list[pg.Rect]   # прямоугольники-люди в локальных координатах (x0..x1, y=0), по возрастанию x
     width: int            # ширина всего коридора (в пикселях)
+    starts: list[int] = field(init=False, repr=False)
+    strip: pg.Surface | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.starts = [r.x for r in self.gaps]
+
+    @property
+    def period(self) -> int:
+        """Через сколько пикселей ряд повторяется."""
+        return self.width + OB_WRAP_GAP
+
+    def get_strip(self) -> pg.Surface:
+        """Весь ряд, отрисованный один раз в полосу period x OB_PERSON_H (люди не меняются)."""
+        if self.strip is None:
+            strip = pg.Surface((self.period, OB_PERSON_H), pg.SRCALPHA)
+            for r in self.gaps:
+                pg.draw.rect(strip, (170, 70, 70), r, border_radius=8)
+            self.strip = strip.convert_alpha()
+        return self.strip
+
+    def hit(self, x0: float, x1: float, grace: int = 0) -> bool:
+        """
+        Задевает ли кто-то из людей локальный отрезок [x0, x1); края людей срезаны на grace.
+        Люди не перекрываются и отсортированы, значит и их правые края тоже:
+        достаточно проверить последнего, кто начинается левее x1.
+        """
+        i = bisect_left(self.starts, x1 - grace)
+        return i > 0 and self.gaps[i - 1].right - grace > x0
 
 class PuhovikGame(BaseScene):
     """
@@ -44,11 +77,17 @@ class PuhovikGame(BaseScene):
       — Столкнулся — проигрыш (retry-катсцена).
       — Добежал до финиша — победа, ачивка «Зато шубка есть».
     Управление: A/D или ←/→ — влево/вправо.
+
+    endless=True — бесконечный забег без финиша: ряды генерируются по мере
+    продвижения из генератора с сидом seed, ушедшие за нижний край выбрасываются,
+    так что память не растёт с дистанцией.
     """
 
-    def __init__(self, manager, state):
+    def __init__(self, manager, state, endless=False, seed=None):
         super().__init__(manager)
         self.state = state
+        self.endless = endless
+        self.seed = seed
         self.W, self.H = self.screen.get_size()
 
         # Игровая «дорожка»
@@ -64,10 +103,11 @@ class PuhovikGame(BaseScene):
         # Скорости/сложность
         self.auto_speed = AUTO_RUN_SPEED
         self.spawn_timer = 0.0
-        self.next_row_y = -OB_LANE_H   # ближайшая «дорожка» сверху (мировая Y)
+        self.next_row_y = -OB_LANE_H   # ближайшая ещё не созданная «дорожка» сверху (мировая Y)
 
-        # Потоки людей
+        # Потоки людей: по убыванию y (снизу вверх по экрану); ряды берутся из генератора
         self.streams: list[Crowd] = []
+        self._rows = self._row_source(random.Random(seed) if endless else RND)
 
         # Эффекты
         self.shake_t = 0.0
@@ -91,35 +131,79 @@ class PuhovikGame(BaseScene):
                        int(self.player_y - self.player_h//2),
                        self.player_w, self.player_h)
 
-    def _spawn_crowd_row(self, y: float, hard: bool = False):
-        """Создаёт один или два потокa на мировой «дорожке» y."""
+    def _row_source(self, rng: random.Random):
+        """
+        Бесконечный генератор рядов: список потоков (один или два) для каждой
+        следующей «дорожки», сверху вниз по миру. Сложность зависит только от
+        положения ряда, поэтому при одном seed ряды одинаковы при любом FPS.
+        """
         width = self.right - self.left
-        def make_stream(dir_sign: int) -> Crowd:
-            speed = RND.uniform(OB_SPEED_MIN, OB_SPEED_MAX)
+
+        def make_stream(y: float, dir_sign: int) -> Crowd:
+            speed = rng.uniform(OB_SPEED_MIN, OB_SPEED_MAX)
             # формы «людей» – набор прямоугольников через интервал
             gaps: list[pg.Rect] = []
             x = 0
             while x < width:
-                w = RND.randint(*OB_WIDTH_RANGE)
-                gaps.append(pg.Rect(x, 0, w, 40))
-                x += w + RND.randint(18, 46)
+                w = rng.randint(*OB_WIDTH_RANGE)
+                gaps.append(pg.Rect(x, 0, w, OB_PERSON_H))
+                x += w + rng.randint(18, 46)
             return Crowd(y=y, dir=dir_sign, speed=speed, gaps=gaps, width=width)
 
-        if hard:
-            # двойной поток: слева->право и справа->лево
-            self.streams.append(make_stream(+1))
-            self.streams.append(make_stream(-1))
-        else:
-            self.streams.append(make_stream(RND.choice((-1, +1))))
+        y = -OB_LANE_H
+        while True:
+            # дистанция, на которой игрок увидит этот ряд впереди, и скорость бега на ней
+            dist = max(0.0, -y - OB_LANE_H * OB_ROWS_AHEAD)
+            speed = AUTO_RUN_SPEED + ACCEL_PER_MIN * (dist / (60.0 * AUTO_RUN_SPEED))
+            if rng.random() < HARD_CHANCE_PER_MIN * (dist / (60.0 * speed)):
+                # двойной поток: слева->право и справа->лево
+                yield [make_stream(y, +1), make_stream(y, -1)]
+            else:
+                yield [make_stream(y, rng.choice((-1, +1)))]
+            y -= OB_LANE_H
 
     def _maybe_spawn_rows_ahead(self):
-        """Гарантирует «трубу» из нескольких рядов впереди игрока."""
-        ahead_limit = self.world_y - OB_LANE_H * OB_ROWS_AHEAD
+        """Гарантирует «трубу» из нескольких рядов впереди игрока и выбрасывает ушедшие вниз."""
+        ahead_limit = -self.world_y - OB_LANE_H * OB_ROWS_AHEAD
         while self.next_row_y > ahead_limit:
-            hard = RND.random() < (HARD_CHANCE_PER_MIN * (self.world_y / (60.0 * self.auto_speed)))
-            self._spawn_crowd_row(self.next_row_y, hard=hard)
+            self.streams.extend(next(self._rows))
             self.next_row_y -= OB_LANE_H
 
+        # ряд целиком ниже экрана: s.y + world_y + base - H/2 > H
+        gone = bisect_left(self.streams, self._row_key(self.H + OB_PERSON_H // 2), key=self._neg_y)
+        if gone:
+            del self.streams[:gone]
+
+    # --- геометрия рядов: экранная Y и левый край ряда ---
+    @staticmethod
+    def _neg_y(s: Crowd) -> float:
+        return -s.y
+
+    def _row_key(self, screen_y: float) -> float:
+        """-мировая y ряда, центр которого сейчас на экранной высоте screen_y (ключ сортировки streams)."""
+        return self.world_y + self.H * ROW_BASE_Y_K - screen_y
+
+    def _row_screen_y(self, s: Crowd) -> float:
+        # экранная Y = (мировая y + смещение камеры) + базовая высота
+        return (s.y + self.world_y) + self.H * ROW_BASE_Y_K
+
+    def _row_x0(self, s: Crowd) -> int:
+        """
+        Левый край первой из двух копий ряда. Ряд зациклен с периодом s.period;
+        копии в x0 и x0 + period вместе накрывают всю дорожку с запасом 60 px.
+        """
+        # горизонтальный сдвиг всего ряда (бесконечный зацикленный бегун): растёт при dir = +1
+        shift = (pg.time.get_ticks() * 0.001 * s.speed * s.dir) % s.period
+        return int(self.left - 60 - s.period + shift)
+
+    def _rows_between(self, top: float, bottom: float) -> list[Crowd]:
+        """Потоки, чья полоса людей по экранной Y пересекает [top, bottom)."""
+        half = OB_PERSON_H // 2
+        # полоса ряда [sy - half, sy + half): sy < bottom + half и sy > top - half
+        i = bisect_right(self.streams, self._row_key(bottom + half), key=self._neg_y)
+        j = bisect_left(self.streams, self._row_key(top - half), key=self._neg_y)
+        return self.streams[i:j]
+
     # ------------- События -------------
     def handle_event(self, e):
         if self.intro and not self.intro.done:
@@ -148,35 +232,19 @@ class PuhovikGame(BaseScene):
         # гарантируем ряды впереди
         self._maybe_spawn_rows_ahead()
 
-        # апдейт потоков: их мировая Y сдвигается вниз вместе с камерой
-        cam_offset = self.world_y  # сколько «прокрутили» мира
+        # столкновения: только ряды на высоте игрока (люди ужаты на HIT_GRACE по краям),
+        # в ряду — поиск по отсортированным левым краям людей
         prect = self._player_rect()
-
-        collide = False
-        for s in self.streams:
-            # экранная Y = (мировая y + смещение камеры) + базовая высота
-            screen_y = (s.y + cam_offset) + self.H * 0.18
-            # горизонтальный сдвиг всего ряда (бесконечный зацикленный бегун)
-            shift = (pg.time.get_ticks() * 0.001 * s.speed * s.dir) % (s.width + 120)
-            base_x = self.left - 60 - shift if s.dir > 0 else self.left - 60 + shift
-
-            # проверка столкновений с «людьми» ряда
-            for r in s.gaps:
-                rr = pg.Rect(int(base_x + r.x), int(screen_y - 20), r.w, r.h)
-                # сам «человек» — это прямоугольник; можно немного «скруглить»:
-                inflated = rr.inflate(-HIT_GRACE, -HIT_GRACE)
-                if inflated.colliderect(prect):
-                    collide = True
-                    break
-            if collide:
-                break
-
-        if collide:
-            self._lose()
-            return
+        g = HIT_GRACE // 2
+        for s in self._rows_between(prect.top + g, prect.bottom - g):
+            x0 = self._row_x0(s)
+            x1 = x0 + s.period
+            if s.hit(prect.left - x0, prect.right - x0, g) or s.hit(prect.left - x1, prect.right - x1, g):
+                self._lose()
+                return
 
         # Победа по дистанции
-        if self.world_y >= DIST_TO_GOAL:
+        if not self.endless and self.world_y >= DIST_TO_GOAL:
             self._win()
             return
 
@@ -201,6 +269,15 @@ class PuhovikGame(BaseScene):
 
     def _lose(self):
         self.dead = True
+        if self.endless:
+            try:
+                from core.ui import TOASTS
+                TOASTS.push(f"Дистанция: {int(self.world_y / 10)} м", ttl=2.6)
+            except Exception:
+                pass
+            # ретрай сразу в тот же забег: кат-сцена по ключу "puhovik" потеряла бы режим и сид
+            self.mgr.switch(PuhovikGame, state=self.state, endless=True, seed=self.seed)
+            return
         from scenes.cutscene import CutsceneScene
         self.mgr.switch(CutsceneScene, state=self.state,
                         script_file="script_ch4_puhovik_retry.json", next_scene="puhovik")
@@ -220,27 +297,28 @@ class PuhovikGame(BaseScene):
         pg.draw.rect(surf, (34, 34, 46), (self.right, 0, self.W - self.right, self.H))
         pg.draw.rect(surf, (44, 44, 58), (self.left, 0, self.right - self.left, self.H), 2)
 
-        # потоки людей (как капсулы)
-        cam_offset = self.world_y
-        for s in self.streams:
-            screen_y = (s.y + cam_offset) + self.H * 0.18
-            shift = (pg.time.get_ticks() * 0.001 * s.speed * s.dir) % (s.width + 120)
-            base_x = self.left - 60 - shift if s.dir > 0 else self.left - 60 + shift
-            for r in s.gaps:
-                rr = pg.Rect(int(base_x + r.x), int(screen_y - 20), r.w, r.h)
-                pg.draw.rect(surf, (170, 70, 70), rr, border_radius=8)
+        # потоки людей (как капсулы) — только видимые ряды, каждый двумя блитами готовой полосы
+        for s in self._rows_between(0, self.H):
+            y = int(self._row_screen_y(s) - OB_PERSON_H // 2)
+            x0 = self._row_x0(s)
+            strip = s.get_strip()
+            surf.blit(strip, (x0, y))
+            surf.blit(strip, (x0 + s.period, y))
 
         # игрок
         prect = self._player_rect()
         pg.draw.rect(surf, (220, 220, 240), prect, border_radius=8)
 
-        # прогресс
-        bar_w = 360
-        pg.draw.rect(surf, (50, 58, 66), (20, 18, bar_w, 16), border_radius=4)
-        k = max(0.0, min(1.0, self.world_y / DIST_TO_GOAL))
-        pg.draw.rect(surf, (120, 220, 140), (20, 18, int(bar_w * k), 16), border_radius=4)
-        txt = pg.font.SysFont(None, 22).render("Догони героиню", True, (220, 220, 230))
-        surf.blit(txt, (20, 40))
+        # прогресс (в бесконечном режиме — просто дистанция)
+        if self.endless:
+            surf.blit(render(f"Дистанция: {int(self.world_y / 10)} м", 22, (220, 220, 230)), (20, 18))
+        else:
+            bar_w = 360
+            pg.draw.rect(surf, (50, 58, 66), (20, 18, bar_w, 16), border_radius=4)
+            k = max(0.0, min(1.0, self.world_y / DIST_TO_GOAL))
+            pg.draw.rect(surf, (120, 220, 140), (20, 18, int(bar_w * k), 16), border_radius=4)
+            txt = render("Догони героиню", 22, (220, 220, 230))
+            surf.blit(txt, (20, 40))
 
         # интро-заставка
         if self.intro and not self.intro.done:
@@ -3,8 +3,8 @@ from __future__ import annotations
 import random
 import pygame as pg
 import math
-from dataclasses import dataclass
 from core.base_scene import BaseScene
+from core.text import render
 
 RND = random.Random()
 
@@ -30,18 +30,72 @@ UMBRELLA_COOLDOWN   = 1.10        # перезарядка
 UMBRELLA_OPEN_TIME  = 0.10        # фаза открытия
 UMBRELLA_CLOSE_TIME = 0.10        # фаза закрытия
 
+# лучи
+BEAM_POOL_SIZE      = COLS * 4    # стартовый размер пула (волна ≤ COLS, луч живёт ~1.5 с); при нехватке растёт
+SPLASH_TIME         = 0.22        # длительность всплеска
+
 # визуал
 FLASH_FREQ          = 8.5         # мерцание предупреждения
+BLINK_STEPS         = 16          # столько заранее отрисованных фаз мерцания
 SHAKE_ON_HIT        = 6           # пиксели
 SHAKE_TIME          = 0.18        # сек
 
 
-@dataclass
+# состояния луча
+WARN, FALL, SPLASH = 0, 1, 2
+
+
 class Beam:
-    col: int
-    state: str  # "warn" | "fall" | "splash"
-    t: float = 0.0
-    y: float = 0.0
+    __slots__ = ("col", "state", "t", "y", "slot")
+
+    def __init__(self):
+        self.col = 0
+        self.state = WARN
+        self.t = 0.0
+        self.y = 0.0
+        self.slot = -1   # индекс в BeamPool.live
+
+
+class BeamPool:
+    """
+    Набор лучей, переиспользуемых между волнами. Если свободных не осталось,
+    пул дорастает на chunk лучей (и один раз пишет об этом) — луч не теряется.
+    live — активные лучи; освобождение — перестановка последнего на место
+    освобождённого, так что обход live с конца можно совмещать с release().
+    """
+
+    def __init__(self, capacity: int, chunk: int = COLS):
+        self.free = [Beam() for _ in range(capacity)]
+        self.live: list[Beam] = []
+        self.chunk = chunk
+        self.grown = 0   # сколько раз пулу не хватило стартового размера
+
+    def spawn(self, col: int) -> Beam:
+        """Новый луч-предупреждение в колонке col."""
+        if not self.free:
+            if not self.grown:
+                print(f"RainGame: beam pool exhausted at {len(self.live)}, growing by {self.chunk}")
+            self.grown += 1
+            self.free.extend(Beam() for _ in range(self.chunk))
+        b = self.free.pop()
+        b.col, b.state, b.t, b.y = col, WARN, 0.0, 0.0
+        b.slot = len(self.live)
+        self.live.append(b)
+        return b
+
+    def release(self, b: Beam):
+        last = self.live.pop()
+        if last is not b:
+            self.live[b.slot] = last
+            last.slot = b.slot
+        b.slot = -1
+        self.free.append(b)
+
+    def clear(self):
+        for b in self.live:
+            b.slot = -1
+        self.free.extend(self.live)
+        self.live.clear()
 
 
 class RainGame(BaseScene):
@@ -84,8 +138,9 @@ class RainGame(BaseScene):
         self.drop_speed = BASE_DROP_SPEED
         self.wave_interval = WAVE_INTERVAL
 
-        # лучи
-        self.beams: list[Beam] = []
+        # лучи и их заранее отрисованные спрайты
+        self.beams = BeamPool(BEAM_POOL_SIZE)
+        self._build_beam_sprites()
 
         # эффекты
         self.shake_t = 0.0
@@ -106,6 +161,32 @@ class RainGame(BaseScene):
         x = self.col_x0 + lane * self.col_w + self.col_w // 2
         return x
 
+    def _build_beam_sprites(self):
+        """
+        Всё, что рисуется для луча, — готовые поверхности под ширину колонки:
+        BLINK_STEPS фаз предупреждения (таблица синуса посчитана один раз),
+        столб падения на всю высоту (в кадре блитится его нижняя часть) и всплеск.
+        """
+        cw = self.col_w
+        self.warn_sprites = []
+        for i in range(BLINK_STEPS):
+            blink = 0.5 + 0.5 * math.sin(2 * math.pi * i / BLINK_STEPS)
+            color = (120 + int(60*blink), 170 + int(50*blink), 255)
+            spr = pg.Surface((cw - 12, 10), pg.SRCALPHA)
+            pg.draw.rect(spr, color, spr.get_rect(), border_radius=3)
+            self.warn_sprites.append(spr.convert_alpha())
+
+        # столб: боковые полосы 2 px, ядро 6 px со скруглением; центр на x = 5
+        fall = pg.Surface((10, self.ground_y), pg.SRCALPHA)
+        pg.draw.rect(fall, (100, 150, 220), (0, 0, 2, self.ground_y))
+        pg.draw.rect(fall, (100, 150, 220), (8, 0, 2, self.ground_y))
+        pg.draw.rect(fall, (130, 180, 255), (2, 0, 6, self.ground_y), border_radius=3)
+        self.fall_sprite = fall.convert_alpha()
+
+        splash = pg.Surface((cw - 20, 2), pg.SRCALPHA)
+        splash.fill((160, 200, 255))
+        self.splash_sprite = splash.convert_alpha()
+
     def _player_rect(self) -> pg.Rect:
         return pg.Rect(int(self.x_center - self.player_w//2),
                        int(self.player_y),
@@ -182,32 +263,35 @@ class RainGame(BaseScene):
         count = RND.choice((1, 2, 2, 3))
         cols = RND.sample(range(COLS), count)
         for c in cols:
-            self.beams.append(Beam(col=c, state="warn"))
+            self.beams.spawn(c)
 
         # иногда «ловушка» — почти все колонки, кроме одной
         # (редко, чтобы не бесить)
         if RND.random() < 0.08 and COLS >= 5:
             safe = RND.randrange(COLS)
-            self.beams = [Beam(col=i, state="warn") for i in range(COLS) if i != safe]
+            self.beams.clear()
+            for i in range(COLS):
+                if i != safe:
+                    self.beams.spawn(i)
 
     def _update_beams(self, dt: float):
-        to_remove = []
-        for i, b in enumerate(self.beams):
-            if b.state == "warn":
+        live = self.beams.live
+        # с конца: release() ставит на место луча последний, уже обработанный
+        for i in range(len(live) - 1, -1, -1):
+            b = live[i]
+            if b.state == WARN:
                 b.t += dt
                 if b.t >= WARN_TIME:
-                    b.state = "fall"; b.t = 0.0; b.y = 0.0
-            elif b.state == "fall":
+                    b.state = FALL; b.t = 0.0; b.y = 0.0
+            elif b.state == FALL:
                 b.y += self.drop_speed * dt
                 if b.y >= self._drop_h():
                     self._resolve_hit(b)
-                    b.state = "splash"; b.t = 0.0
-            elif b.state == "splash":
+                    b.state = SPLASH; b.t = 0.0
+            else:
                 b.t += dt
-                if b.t >= 0.22:
-                    to_remove.append(i)
-        for idx in reversed(to_remove):
-            self.beams.pop(idx)
+                if b.t >= SPLASH_TIME:
+                    self.beams.release(b)
 
     def _drop_h(self) -> int:
         return self.ground_y
@@ -267,27 +351,22 @@ class RainGame(BaseScene):
             x = self.col_x0 + i * self.col_w + ox
             pg.draw.line(surf, (30, 36, 52), (x, 0 + oy), (x, self.ground_y + oy), 1)
 
-        # лучи
-        for b in self.beams:
+        # лучи — одним blits из готовых спрайтов
+        warn = self.warn_sprites[int(pg.time.get_ticks() * 0.001 * FLASH_FREQ * BLINK_STEPS) % BLINK_STEPS]
+        fall_h = self.ground_y
+        jobs = []
+        for b in self.beams.live:
             x = self.col_x0 + b.col * self.col_w + ox
-            if b.state == "warn":
-                blink = 0.5 + 0.5 * math.sin(pg.time.get_ticks() * 0.001 * 2 * 3.14159 * FLASH_FREQ)
-                color = (120 + int(60*blink), 170 + int(50*blink), 255)
-                r = pg.Rect(x + 6, 8 + oy, self.col_w - 12, 10)
-                pg.draw.rect(surf, color, r, border_radius=3)
-            elif b.state == "fall":
-                top = 0 + oy
-                bottom = min(int(b.y) + oy, self.ground_y + oy)
-                cx = x + self.col_w // 2
-                core = pg.Rect(cx - 3, top, 6, bottom - top)
-                side1 = pg.Rect(cx - 5, top, 2, bottom - top)
-                side2 = pg.Rect(cx + 3, top, 2, bottom - top)
-                pg.draw.rect(surf, (130, 180, 255), core, border_radius=3)
-                pg.draw.rect(surf, (100, 150, 220), side1)
-                pg.draw.rect(surf, (100, 150, 220), side2)
-            elif b.state == "splash":
-                y = self.ground_y + oy
-                pg.draw.line(surf, (160, 200, 255), (x + 10, y), (x + self.col_w - 10, y), 2)
+            if b.state == WARN:
+                jobs.append((warn, (x + 6, 8 + oy)))
+            elif b.state == FALL:
+                h = min(int(b.y), fall_h)
+                if h > 0:
+                    # нижние h пикселей столба: скруглённый «носик» всегда внизу
+                    jobs.append((self.fall_sprite, (x + self.col_w // 2 - 5, oy), (0, fall_h - h, 10, h)))
+            else:
+                jobs.append((self.splash_sprite, (x + 10, self.ground_y + oy - 1)))
+        surf.blits(jobs, doreturn=False)
 
         # игрок
         prect = self._player_rect().move(ox, oy)
@@ -326,5 +405,5 @@ class RainGame(BaseScene):
 
         # таймер
         remain = max(0.0, SURVIVE_TIME - self.time_alive)
-        txt = pg.font.SysFont(None, 22).render(f"Осталось: {remain:0.1f}с", True, (220, 220, 230))
+        txt = render(f"Осталось: {remain:0.1f}с", 22, (220, 220, 230))
         surf.blit(txt, (20, 56))
@@ -0,0 +1,162 @@
+# tools/bake_assets.py
+"""
+Запекание картинок под реальные размеры отрисовки.
+
+Исходники фонов — 1536x1024, а окно игры 960x540; портреты рисуются
+высотой 409 px. Здесь каждая такая картинка заранее уменьшается
+(smoothscale), полностью непрозрачные теряют альфа-канал, результат
+кладётся в build/assets/, а core.resources.img_scaled() берёт его вместо
+того, чтобы декодировать исходник и масштабировать в рантайме.
+
+Работает параллельно (по процессу на картинку) и инкрементально:
+в build/assets/manifest.json хранится sha1 исходника, неизменённые
+картинки пропускаются. Черновики (drafts/, .zip, .pixil) не трогаем.
+
+    python tools/bake_assets.py [--jobs N] [--force]
+"""
+import os, sys, json, glob, struct, hashlib, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame as pg
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMG_DIR = os.path.join(BASE, "assets", "img")
+OUT_DIR = os.path.join(BASE, "build", "assets")
+MANIFEST = os.path.join(OUT_DIR, "manifest.json")
+
+# размеры, в которых игра реально рисует картинки (см. main.py и CutsceneScene)
+WIDTH, HEIGHT = 960, 540
+PORTRAIT_H = int(int(HEIGHT * 0.17) * 4.5)
+
+# (маска относительно assets/img, целевой размер; None — по пропорциям)
+TARGETS = [
+    ("ch[1-4]/*.png", (WIDTH, HEIGHT)),     # фоны кат-сцен и заставок
+    ("portraits/*.png", (None, PORTRAIT_H)),
+]
+
+
+def _sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _png_size(path):
+    # размер из заголовка IHDR — не декодируем картинку целиком
+    with open(path, "rb") as f:
+        head = f.read(24)
+    return struct.unpack(">II", head[16:24])
+
+
+def _target_size(src_size, size):
+    sw, sh = src_size
+    w, h = size
+    if w is None:
+        w = max(1, int(sw * (h / sh)))
+    elif h is None:
+        h = max(1, int(sh * (w / sw)))
+    return w, h
+
+
+def _out_name(rel, size):
+    stem, _ext = os.path.splitext(rel)
+    return f"img/{stem}@{size[0]}x{size[1]}.png"
+
+
+def bake_one(job):
+    """Выполняется в отдельном процессе: уменьшить, убрать лишнюю альфу, сохранить."""
+    src, out, size = job
+    surf = pg.image.load(src)
+    if surf.get_bitsize() < 24:
+        # палитровые картинки smoothscale не принимает
+        surf = _to_rgba(surf)
+    if surf.get_size() != tuple(size):
+        surf = pg.transform.smoothscale(surf, size)
+
+    alpha = bool(surf.get_flags() & pg.SRCALPHA)
+    if alpha and pg.mask.from_surface(surf, 254).count() == size[0] * size[1]:
+        # альфа везде 255 — храним как RGB, в игре пойдёт через convert()
+        rgb = pg.Surface(size, 0, 24)
+        rgb.blit(surf, (0, 0))
+        surf, alpha = rgb, False
+
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    pg.image.save(surf, out)
+    return alpha
+
+
+def _to_rgba(surf):
+    rgba = pg.Surface(surf.get_size(), pg.SRCALPHA, 32)
+    rgba.blit(surf, (0, 0))
+    return rgba
+
+
+def collect():
+    """Список (rel, size) всех вариантов, которые нужно запечь."""
+    items = []
+    for pattern, size in TARGETS:
+        for path in sorted(glob.glob(os.path.join(IMG_DIR, pattern))):
+            rel = os.path.relpath(path, IMG_DIR).replace(os.sep, "/")
+            items.append((rel, size))
+    return items
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bake display-sized images into build/assets")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--force", action="store_true", help="перезапечь всё, игнорируя манифест")
+    args = ap.parse_args(argv)
+
+    try:
+        with open(MANIFEST, "r", encoding="utf-8") as f:
+            old = json.load(f).get("items", {})
+    except (OSError, ValueError):
+        old = {}
+
+    items, jobs = {}, []
+    for rel, size in collect():
+        src = os.path.join(IMG_DIR, rel)
+        sha = _sha1(src)
+        src_size = _png_size(src)
+        if size[0] is not None and size[1] is not None and \
+                (src_size[0] < size[0] or src_size[1] < size[1]):
+            continue  # мелкие картинки (иконки и т.п.) не растягиваем
+        out_size = _target_size(src_size, size)
+        out = _out_name(rel, out_size)
+        key = f"{rel}@{out_size[0]}x{out_size[1]}"
+        prev = old.get(key)
+        item = {"src": rel, "src_size": list(src_size), "size": list(out_size),
+                "sha1": sha, "out": out, "alpha": prev["alpha"] if prev else True}
+        items[key] = item
+        if args.force or not prev or prev["sha1"] != sha \
+                or not os.path.exists(os.path.join(OUT_DIR, out)):
+            jobs.append(key)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            work = [(os.path.join(IMG_DIR, items[k]["src"]), os.path.join(OUT_DIR, items[k]["out"]),
+                     tuple(items[k]["size"])) for k in jobs]
+            for key, alpha in zip(jobs, pool.map(bake_one, work)):
+                items[key]["alpha"] = alpha
+                print("Baked:", items[key]["out"])
+
+    # исходник удалён/переименован — убираем и его запечённый файл
+    for key, prev in old.items():
+        if key not in items:
+            try:
+                os.remove(os.path.join(OUT_DIR, prev["out"]))
+            except OSError:
+                pass
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    with open(MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "items": items}, f, ensure_ascii=False, indent=2)
+    print(f"{len(jobs)} baked, {len(items) - len(jobs)} up to date -> {OUT_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# tools/bench.py
+"""
+Headless-бенчмарк всех сцен под SDL dummy-драйвером.
+
+Каждая сцена создаётся со скриптованным вводом (зажатые клавиши подменяются,
+события подаются напрямую в сцену) и гоняется N кадров с фиксированным dt
+без ограничения FPS. На выходе — JSON: время update/draw, пропускная
+способность, сборки мусора и временные аллокации за кадр. Отдельно меряется
+генератор лабиринтов core.maze.generate на большой карте: если он медленнее
+GENERATE_BUDGET_MS, бенчмарк завершается с кодом 1.
+
+    python -m tools.bench [--frames 600] [--dt 0.016667] [--only Concert] [--out bench.json]
+"""
+import os, sys, gc, json, time, random, argparse, importlib, tracemalloc
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame as pg
+
+WIDTH, HEIGHT = 960, 540
+
+GAME_SCENES = [
+    ("scenes.concert_game", "ConcertGame"),
+    ("scenes.balance_game", "BalanceGame"),
+    ("scenes.maze_game", "MazeGame"),
+    ("scenes.oracle_game", "OracleGame"),
+    ("scenes.rain_game", "RainGame"),
+    ("scenes.puhovik_game", "PuhovikGame"),
+    ("scenes.birthday_game", "BirthdayGame"),
+    ("scenes.achievements_view", "AchievementsView"),
+]
+
+# те же сцены в особых режимах: (модуль, класс, суффикс имени, аргументы)
+SCENE_VARIANTS = [
+    ("scenes.oracle_game", "OracleGame", "bullet_hell", {"bullet_hell": True}),
+    ("scenes.concert_game", "ConcertGame", "crowd3000", {"n_bullies": 3000}),
+    ("scenes.puhovik_game", "PuhovikGame", "endless", {"endless": True, "seed": 1}),
+    ("scenes.maze_game", "MazeGame", "generated", {"seed": 1}),
+]
+
+# генератор лабиринтов: карта GENERATE_SIZE x GENERATE_SIZE должна строиться быстрее бюджета
+GENERATE_SIZE = 2001
+GENERATE_BUDGET_MS = 100.0
+
+
+class ScriptedKeys:
+    """Подмена pg.key.get_pressed(): набор зажатых клавиш задаёт скрипт."""
+
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+    def __call__(self):
+        return self
+
+
+def default_script(frame: int):
+    """
+    Ввод на кадр: (зажатые клавиши, события).
+    Каждые полсекунды меняем направление, SPACE жмём 4 раза в секунду;
+    на кадре 0 — нажатие, которое закрывает заставку MiniIntro.
+    """
+    dirs = ((pg.K_RIGHT,), (pg.K_DOWN,), (pg.K_LEFT,), (pg.K_UP,),
+            (pg.K_RIGHT, pg.K_DOWN), (pg.K_LEFT, pg.K_UP))
+    held = set(dirs[(frame // 30) % len(dirs)])
+    events = []
+    if frame % 15 == 0:
+        events.append(pg.event.Event(pg.KEYDOWN, key=pg.K_SPACE, mod=0, unicode=" "))
+    if frame % 40 == 20:
+        events.append(pg.event.Event(pg.KEYDOWN, key=pg.K_RIGHT, mod=0, unicode=""))
+    return held, events
+
+
+class BenchManager:
+    """
+    Минимальный менеджер сцен для бенчмарка: switch() не уходит в другую
+    сцену, а пересоздаёт замеряемую — так проигрыш/победа не прерывают прогон.
+    Перед каждым созданием сцены генераторы случайных чисел пересеиваются:
+    случайность в конструкторе (раскладка, спавн) тоже воспроизводима.
+    """
+
+    def __init__(self, screen, factory, seed=1234):
+        self.screen = screen
+        self.dirty_rects = False
+        self.factory = factory
+        self.seed = seed
+        self.switches = 0
+        self.scene = self._create()
+
+    def _create(self):
+        _seed_rngs(self.seed)
+        return self.factory(self)
+
+    def switch(self, scene_cls, **kwargs):
+        self.switches += 1
+        self.scene = self._create()
+
+    def preload(self, scene_cls, **kwargs):
+        return []  # переходов нет — и греть нечего
+
+
+def _seed_rngs(seed):
+    """Сеет общий random и модульные RND всех загруженных сцен."""
+    random.seed(seed)
+    for name, mod in list(sys.modules.items()):
+        rnd = getattr(mod, "RND", None) if name.startswith("scenes.") else None
+        if isinstance(rnd, random.Random):
+            rnd.seed(seed)
+
+
+def bench_scene(name, factory, screen, frames, dt, seed=1234):
+    from core.ui import TOASTS
+    from core.resources import poll_async
+    keys = ScriptedKeys()
+    real_get_pressed = pg.key.get_pressed
+    pg.key.get_pressed = keys
+    TOASTS.items.clear()
+    try:
+        t = time.perf_counter()
+        mgr = BenchManager(screen, factory, seed)
+        construct_ms = (time.perf_counter() - t) * 1000.0
+
+        def step(i):
+            held, events = default_script(i)
+            keys.held = held
+            pg.event.clear()
+            for e in events:
+                mgr.scene.handle_event(e)
+            t0 = time.perf_counter()
+            poll_async()
+            mgr.scene.update(dt)
+            TOASTS.update(dt)
+            t1 = time.perf_counter()
+            mgr.scene.invalidate()
+            mgr.scene.draw()
+            TOASTS.draw(screen)
+            t2 = time.perf_counter()
+            return t1 - t0, t2 - t1
+
+        # проход 1: время (без трассировки памяти, чтобы не искажать)
+        gc_before = [s["collections"] for s in gc.get_stats()]
+        blocks_before = sys.getallocatedblocks()
+        upd = drw = 0.0
+        worst = 0.0
+        for i in range(frames):
+            u, d = step(i)
+            upd += u; drw += d
+            worst = max(worst, u + d)
+        blocks_net = sys.getallocatedblocks() - blocks_before
+        gc_runs = [s["collections"] - b for s, b in zip(gc.get_stats(), gc_before)]
+
+        # проход 2: временные аллокации за кадр (tracemalloc, короткий)
+        mem_frames = max(1, min(frames, 120))
+        tracemalloc.start()
+        transient = 0
+        for i in range(frames, frames + mem_frames):
+            cur, _peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            step(i)
+            transient += tracemalloc.get_traced_memory()[1] - cur
+        tracemalloc.stop()
+
+        total = upd + drw
+        return {
+            "name": name,
+            "construct_ms": round(construct_ms, 3),
+            "update_ms_mean": round(upd * 1000.0 / frames, 4),
+            "draw_ms_mean": round(drw * 1000.0 / frames, 4),
+            "frame_ms_worst": round(worst * 1000.0, 3),
+            "updates_per_sec": round(frames / upd, 1) if upd else None,
+            "draws_per_sec": round(frames / drw, 1) if drw else None,
+            "frames_per_sec": round(frames / total, 1) if total else None,
+            "switches": mgr.switches,
+            "gc_collections": gc_runs,
+            "alloc_blocks_net": blocks_net,
+            "alloc_kb_per_frame": round(transient / mem_frames / 1024.0, 2),
+        }
+    except Exception as e:
+        return {"name": name, "error": repr(e)}
+    finally:
+        pg.key.get_pressed = real_get_pressed
+        TOASTS.items.clear()
+
+
+def collect_scenes():
+    """(имя, фабрика сцены) для всех сцен игры и всех скриптов кат-сцен."""
+    from core.state import GameState
+    from core.resources import asset_index
+    from scenes.menu import MenuScene
+    from scenes.cutscene import CutsceneScene
+
+    out = [("MenuScene", lambda m: MenuScene(m))]
+    data = asset_index("data")
+    for chapter in (d for d in sorted(data.dirs) if d.startswith("ch")):
+        for fn in data.listdir(chapter):
+            if fn.endswith(".json"):
+                script = f"{chapter}/{fn}"
+                out.append((f"CutsceneScene:{script}",
+                            lambda m, s=script: CutsceneScene(m, state=GameState(), script_file=s,
+                                                              next_scene="end")))
+    for mod, cls_name in GAME_SCENES:
+        cls = getattr(importlib.import_module(mod), cls_name)
+        out.append((cls_name, lambda m, c=cls: c(m, state=GameState())))
+    for mod, cls_name, suffix, kwargs in SCENE_VARIANTS:
+        cls = getattr(importlib.import_module(mod), cls_name)
+        out.append((f"{cls_name}:{suffix}", lambda m, c=cls, kw=kwargs: c(m, state=GameState(), **kw)))
+    return out
+
+
+def bench_generate(size=GENERATE_SIZE, repeats=3):
+    """Лучшее время core.maze.generate(size, size) из repeats прогонов."""
+    from core.maze import generate
+    best = float("inf")
+    for seed in range(repeats):
+        t = time.perf_counter()
+        generate(size, size, seed)
+        best = min(best, (time.perf_counter() - t) * 1000.0)
+    return {"name": "maze.generate", "size": size, "best_ms": round(best, 2),
+            "budget_ms": GENERATE_BUDGET_MS, "ok": best <= GENERATE_BUDGET_MS}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless scene benchmark")
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--dt", type=float, default=1.0 / 60)
+    ap.add_argument("--only", default="", help="подстрока имени сцены")
+    ap.add_argument("--out", default="", help="файл для JSON (по умолчанию stdout)")
+    args = ap.parse_args(argv)
+
+    pg.init()
+    screen = pg.display.set_mode((WIDTH, HEIGHT))
+    results = [bench_scene(name, factory, screen, args.frames, args.dt)
+               for name, factory in collect_scenes() if args.only in name]
+    report = {"driver": pg.display.get_driver(), "pygame": pg.version.ver,
+              "frames": args.frames, "dt": args.dt, "scenes": results}
+    gen = bench_generate() if args.only in "maze.generate" else None
+    if gen is not None:
+        report["generate"] = gen
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    pg.quit()
+    if gen is not None and not gen["ok"]:
+        print(f"maze.generate {gen['size']}x{gen['size']}: {gen['best_ms']} ms "
+              f"> budget {GENERATE_BUDGET_MS} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
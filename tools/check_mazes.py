@@ -0,0 +1,71 @@
+# tools/check_mazes.py
+"""
+Проверка карт лабиринта пачкой.
+
+Для каждой data/maze/maze*.txt (или переданных путей) строится поле
+расстояний до выхода (core.maze.MazeLevel) и проверяется, что:
+  * на карте ровно один S и ровно один E;
+  * от S можно дойти до E.
+Проходимые клетки, отрезанные от выхода (оторванные куски карты), выводятся
+предупреждением; с --strict такая карта тоже считается плохой.
+
+Заодно пишется кэш поля рядом с картой (maze1.dist.json), чтобы игра
+не считала его при первом запуске. Код выхода 1, если хоть одна карта плохая.
+
+    python tools/check_mazes.py [data/maze/maze1.txt ...] [--strict] [--no-cache]
+"""
+import os, sys, glob, argparse
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE)
+from core.maze import MazeLevel, START, EXIT
+
+MAZE_DIR = os.path.join(BASE, "data", "maze")
+
+
+def check(path, use_cache=True):
+    """(уровень, ошибки, предупреждения); ошибок нет — карта проходима."""
+    level = MazeLevel.load(path, use_cache=use_cache)
+    problems, warnings = [], []
+    for ch, name in ((START, "start"), (EXIT, "exit")):
+        n = sum(row.count(ch) for row in level.grid)
+        if n != 1:
+            problems.append(f"expected one {name} '{ch}', found {n}")
+    if level.start and level.exit and not level.solvable():
+        problems.append("exit is unreachable from start")
+    if level.exit:
+        islands = level.unreachable_floor()
+        if islands:
+            x, y = islands[0]
+            warnings.append(f"{len(islands)} passable tiles cut off from exit (first at {x},{y})")
+    return level, problems, warnings
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Validate maze levels and cache their distance fields")
+    ap.add_argument("paths", nargs="*", help="файлы карт; по умолчанию data/maze/maze*.txt")
+    ap.add_argument("--strict", action="store_true", help="оторванные куски пола — тоже ошибка")
+    ap.add_argument("--no-cache", action="store_true", help="не читать и не писать *.dist.json")
+    args = ap.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob(os.path.join(MAZE_DIR, "maze*.txt")))
+    bad = 0
+    for path in paths:
+        level, problems, warnings = check(path, use_cache=not args.no_cache)
+        name = os.path.relpath(path, BASE)
+        if args.strict:
+            problems, warnings = problems + warnings, []
+        for w in warnings:
+            print(f"warn {name}: {w}")
+        if problems:
+            bad += 1
+            for p in problems:
+                print(f"FAIL {name}: {p}")
+        else:
+            print(f"ok   {name}: path cost {level.start_dist:.1f}")
+    print(f"{len(paths) - bad}/{len(paths)} levels ok")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
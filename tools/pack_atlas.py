@@ -0,0 +1,106 @@
+# tools/pack_atlas.py
+"""
+Упаковка кадров анимации в один атлас.
+
+Каждый персонаж (папка в assets/img: character, npc, ...) хранит кадры
+отдельными PNG: left_1..4, right_1..4, forward_1..4, back_1..4. Здесь
+кадры всех указанных персонажей складываются в одну картинку полками
+(shelf packing: сортируем по высоте, заполняем ряды слева направо),
+а рядом пишется JSON с картой кадров:
+
+    {"image": "atlas/sprites.png",
+     "actors": {"character": {"left": [[x, y, w, h], ...], ...}, ...}}
+
+AnimatedSprite берёт кадры из атласа как subsurface — один файл,
+одно декодирование, никакого перебора папок в рантайме.
+
+    python tools/pack_atlas.py [character npc ...] [--out atlas/sprites] [--width 1024]
+"""
+import os, sys, json, glob, argparse
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame as pg
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMG_DIR = os.path.join(BASE, "assets", "img")
+sys.path.insert(0, BASE)
+from core.anim import frame_sort_key
+
+DEFAULT_ACTORS = ("character", "npc")
+DIRECTIONS = ("left", "right", "forward", "back")  # как в core.anim.AnimatedSprite
+PADDING = 1  # пустой пиксель между кадрами на листе
+
+
+def actor_frames(actor):
+    """{направление: [пути к кадрам по порядку]} — та же маска, что в AnimatedSprite."""
+    out = {}
+    for d in DIRECTIONS:
+        files = glob.glob(os.path.join(IMG_DIR, actor, f"{d}_*.png"))
+        if not files:
+            files = glob.glob(os.path.join(IMG_DIR, actor, f"vl_{d}_*.png"))
+        out[d] = sorted(files, key=lambda p: frame_sort_key(os.path.basename(p)))
+    return out
+
+
+def shelf_pack(sizes, max_w):
+    """
+    Раскладка прямоугольников полками. sizes — список (w, h);
+    возвращает позиции (x, y) в исходном порядке и итоговый размер листа.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    pos = [None] * len(sizes)
+    x = y = shelf_h = used_w = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_w:
+            y += shelf_h + PADDING
+            x = shelf_h = 0
+        pos[i] = (x, y)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x - PADDING)
+    return pos, (max(1, used_w), max(1, y + shelf_h))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pack per-frame character PNGs into one atlas")
+    ap.add_argument("actors", nargs="*", default=list(DEFAULT_ACTORS))
+    ap.add_argument("--out", default="atlas/sprites", help="путь без расширения относительно assets/img")
+    ap.add_argument("--width", type=int, default=1024, help="максимальная ширина листа")
+    args = ap.parse_args(argv)
+
+    frames = []  # (actor, direction, surface)
+    for actor in args.actors:
+        found = actor_frames(actor)
+        if not any(found.values()):
+            print(f"skip {actor}: no frames")
+            continue
+        for d, paths in found.items():
+            for p in paths:
+                frames.append((actor, d, pg.image.load(p)))
+
+    if not frames:
+        print("nothing to pack")
+        return 1
+
+    pos, size = shelf_pack([s.get_size() for _a, _d, s in frames], args.width)
+    sheet = pg.Surface(size, pg.SRCALPHA, 32)
+    sheet.fill((0, 0, 0, 0))
+    actors = {}
+    for (actor, d, surf), (x, y) in zip(frames, pos):
+        sheet.blit(surf, (x, y))
+        w, h = surf.get_size()
+        actors.setdefault(actor, {k: [] for k in DIRECTIONS})[d].append([x, y, w, h])
+
+    out_png = os.path.join(IMG_DIR, args.out + ".png")
+    os.makedirs(os.path.dirname(out_png), exist_ok=True)
+    pg.image.save(sheet, out_png)
+    with open(os.path.join(IMG_DIR, args.out + ".json"), "w", encoding="utf-8") as f:
+        json.dump({"image": args.out + ".png", "size": list(size), "actors": actors}, f,
+                  separators=(",", ":"))
+    print(f"packed {len(frames)} frames of {len(actors)} actors into {args.out}.png {size[0]}x{size[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())